@@ -1,11 +1,11 @@
 import asyncio
+import functools
 import logging
 import os
 import re
 import sys
 import traceback
 from pathlib import Path
-from textwrap import dedent
 from typing import Any
 
 from beeai_framework.agents.requirement.requirements.conditional import (
@@ -32,12 +32,14 @@ from ymir.agents.utils import (
     get_tool_call_checker_config,
     is_reasoning_enabled,
     mcp_tools,
+    parse_agent_output,
     render_template,
 )
 from ymir.common.logging_setup import configure_logging, get_trajectory_writeable
 from ymir.common.models import (
     BuildInputSchema,
     BuildOutputSchema,
+    MergeRequestComments,
     MergeRequestInputSchema,
     MergeRequestOutputSchema,
 )
@@ -55,8 +57,24 @@ from ymir.tools.unprivileged.wicked_git import BuildSrpmTool, RunPackagePrepTool
 
 logger = logging.getLogger(__name__)
 
+# the schema is static, build it once rather than for every processed MR
+_COMMENTS_SCHEMA = MergeRequestComments.model_json_schema(mode="serialization")
+_COMMENTS_TEMPLATE = """\
+JSON schema of the comments:
+```json
+{schema}
+```
 
+Comments:
+```json
+{comments}
+```
+"""
+
+
+@functools.cache
 def get_instructions() -> str:
+    # static template, render it only once per process
     return render_template("merge_request/instructions.j2")
 
 
@@ -102,6 +120,22 @@ def create_merge_request_agent(mcp_tools: list[Tool], local_tool_options: dict[s
     )
 
 
+_DETAILS_BLOCK_RE = re.compile(r"<details\b[^>]*>.*?</details>", re.DOTALL | re.IGNORECASE)
+_RESOLVED_ISSUES_SECTION_RE = re.compile(
+    r"^#{1,4}\s+Resolved Jira Issues\s*\n+(?:-\s*\[?(RHEL-\d+)\]?)",
+    re.MULTILINE,
+)
+_JIRA_ISSUE_LINE_RES = tuple(
+    re.compile(pattern)
+    for pattern in (
+        r"Resolves:\s+(RHEL-\d+)",
+        r"Related:\s+(RHEL-\d+)",
+        r"Jira:\s+\[(RHEL-\d+)\]",
+        r"\[(RHEL-\d+)\]\(https://(?:issues\.redhat\.com|redhat\.atlassian\.net)/browse/RHEL-\d+\)",
+    )
+)
+
+
 def extract_jira_issue(mr_description: str) -> str:
     """Extract the primary Jira issue key from an MR description.
 
@@ -111,30 +145,37 @@ def extract_jira_issue(mr_description: str) -> str:
     ignored so embedded source descriptions cannot shadow the top-level issue.
     """
     # Strip embeds first so nested "Resolved Jira Issues" sections cannot win
-    text = re.sub(
-        r"<details\b[^>]*>.*?</details>",
-        "",
-        mr_description,
-        flags=re.DOTALL | re.IGNORECASE,
-    )
-    if m := re.search(
-        r"^#{1,4}\s+Resolved Jira Issues\s*\n+(?:-\s*\[?(RHEL-\d+)\]?)",
-        text,
-        re.MULTILINE,
-    ):
+    text = _DETAILS_BLOCK_RE.sub("", mr_description)
+    if m := _RESOLVED_ISSUES_SECTION_RE.search(text):
         return m.group(1)
 
-    for pattern in (
-        r"Resolves:\s+(RHEL-\d+)",
-        r"Related:\s+(RHEL-\d+)",
-        r"Jira:\s+\[(RHEL-\d+)\]",
-        r"\[(RHEL-\d+)\]\(https://(?:issues\.redhat\.com|redhat\.atlassian\.net)/browse/RHEL-\d+\)",
-    ):
-        if m := re.search(pattern, text):
+    for pattern in _JIRA_ISSUE_LINE_RES:
+        if m := pattern.search(text):
             return m.group(1)
     raise RuntimeError("Failed to extract Jira issue from MR description")
 
 
+class MergeRequestState(BaseModel):
+    merge_request_url: str
+    local_clone: Path | None = Field(default=None)
+    local_clone_head: str | None = Field(default=None)
+    package: str | None = Field(default=None)
+    dist_git_branch: str | None = Field(default=None)
+    update_branch: str | None = Field(default=None)
+    fork_url: str | None = Field(default=None)
+    jira_issue: str | None = Field(default=None)
+    merge_request_title: str | None = Field(default=None)
+    merge_request_description: str | None = Field(default=None)
+    merge_request_comments: str | None = Field(default=None)
+    build_error: str | None = Field(default=None)
+    fedora_clone: Path | None = Field(default=None)
+    mr_update_log: list[str] = Field(default_factory=list)
+    mr_update_result: MergeRequestOutputSchema | None = Field(default=None)
+    attempts_remaining: int = Field(default=10)
+    # insertion-ordered (keys only) so files are staged in a deterministic order
+    all_files_git_to_add: dict[str, None] = Field(default_factory=dict)
+
+
 async def main() -> None:
     configure_logging(level=logging.INFO)
 
@@ -143,31 +184,14 @@ async def main() -> None:
     dry_run = os.getenv("DRY_RUN", "False").lower() == "true"
     max_build_attempts = int(os.getenv("MAX_BUILD_ATTEMPTS", "10"))
 
-    class State(BaseModel):
-        merge_request_url: str
-        local_clone: Path | None = Field(default=None)
-        package: str | None = Field(default=None)
-        dist_git_branch: str | None = Field(default=None)
-        update_branch: str | None = Field(default=None)
-        fork_url: str | None = Field(default=None)
-        jira_issue: str | None = Field(default=None)
-        merge_request_title: str | None = Field(default=None)
-        merge_request_description: str | None = Field(default=None)
-        merge_request_comments: str | None = Field(default=None)
-        build_error: str | None = Field(default=None)
-        fedora_clone: Path | None = Field(default=None)
-        mr_update_log: list[str] = Field(default_factory=list)
-        mr_update_result: MergeRequestOutputSchema | None = Field(default=None)
-        attempts_remaining: int = Field(default=max_build_attempts)
-        all_files_git_to_add: set[str] = Field(default_factory=set)
-
     async def run_workflow(merge_request_url):
         local_tool_options = {"working_directory": None}
 
         async with mcp_tools(os.environ["MCP_GATEWAY_URL"]) as gateway_tools:
             merge_request_agent = create_merge_request_agent(gateway_tools, local_tool_options)
+            build_agent = create_build_agent(gateway_tools, local_tool_options)
 
-            workflow = Workflow(State, name="MergeRequestWorkflow")
+            workflow = Workflow(MergeRequestState, name="MergeRequestWorkflow")
 
             async def prepare_dist_git_from_mr(state):
                 (
@@ -184,6 +208,8 @@ async def main() -> None:
                     logger.info("No user feedback provided, nothing to do")
                     return Workflow.END
 
+                # remember where the clone started, build retries reset it back here
+                state.local_clone_head = await tasks.get_head_commit(state.local_clone)
                 state.package = mr_details.target_repo_name
                 state.dist_git_branch = mr_details.target_branch
                 state.update_branch = mr_details.source_branch
@@ -193,20 +219,9 @@ async def main() -> None:
                 state.merge_request_title = mr_details.title
                 state.merge_request_description = mr_details.description
 
-                comments_schema = mr_details.comments.model_json_schema(mode="serialization")
-                comments = mr_details.comments.model_dump_json(indent=4)
-                state.merge_request_comments = dedent(
-                    f"""
-                    JSON schema of the comments:
-                    ```json
-                    {comments_schema}
-                    ```
-
-                    Comments:
-                    ```json
-                    {comments}
-                    ```
-                    """
+                state.merge_request_comments = _COMMENTS_TEMPLATE.format(
+                    schema=_COMMENTS_SCHEMA,
+                    comments=mr_details.comments.model_dump_json(indent=4),
                 )
 
                 local_tool_options["working_directory"] = state.local_clone
@@ -232,19 +247,20 @@ async def main() -> None:
                     expected_output=MergeRequestOutputSchema,
                     **get_agent_execution_config(),
                 )
-                state.mr_update_result = MergeRequestOutputSchema.model_validate_json(
-                    response.last_message.text
-                )
+                state.mr_update_result = parse_agent_output(response, MergeRequestOutputSchema)
                 if state.mr_update_result.success:
                     state.mr_update_log.append(state.mr_update_result.status)
                     # Accumulate files from this iteration
                     if state.mr_update_result.files_to_git_add:
-                        state.all_files_git_to_add.update(state.mr_update_result.files_to_git_add)
+                        state.all_files_git_to_add.update(
+                            dict.fromkeys(state.mr_update_result.files_to_git_add)
+                        )
                     return "run_build_agent"
                 return "comment_in_mr"
 
             async def run_build_agent(state):
-                build_agent = create_build_agent(gateway_tools, local_tool_options)
+                # every build attempt starts with a clean conversation
+                build_agent.memory.reset()
                 response = await build_agent.run(
                     render_template(
                         get_build_prompt(),
@@ -257,7 +273,7 @@ async def main() -> None:
                     expected_output=BuildOutputSchema,
                     **get_agent_execution_config(),
                 )
-                build_result = BuildOutputSchema.model_validate_json(response.last_message.text)
+                build_result = parse_agent_output(response, BuildOutputSchema)
                 if build_result.success:
                     return "stage_changes"
                 if build_result.is_timeout:
@@ -276,7 +292,13 @@ async def main() -> None:
                     )
                     return "comment_in_mr"
                 state.build_error = build_result.error
-                return "prepare_dist_git_from_merge_request"
+                return "reset_local_clone"
+
+            async def reset_local_clone(state):
+                # MR details and the clones don't change between build attempts,
+                # start over from a clean checkout instead of cloning again
+                await tasks.reset_local_clone(state.local_clone, state.local_clone_head)
+                return "run_merge_request_agent"
 
             async def stage_changes(state):
                 # Use accumulated files from all iterations, fallback to *.spec if none specified
@@ -330,11 +352,17 @@ async def main() -> None:
             workflow.add_step("prepare_dist_git_from_mr", prepare_dist_git_from_mr)
             workflow.add_step("run_merge_request_agent", run_merge_request_agent)
             workflow.add_step("run_build_agent", run_build_agent)
+            workflow.add_step("reset_local_clone", reset_local_clone)
             workflow.add_step("stage_changes", stage_changes)
             workflow.add_step("commit_and_push", commit_and_push)
             workflow.add_step("comment_in_mr", comment_in_mr)
 
-            response = await workflow.run(State(merge_request_url=merge_request_url))
+            response = await workflow.run(
+                MergeRequestState(
+                    merge_request_url=merge_request_url,
+                    attempts_remaining=max_build_attempts,
+                )
+            )
             return response.state
 
     if merge_request_url := os.getenv("MERGE_REQUEST_URL", None):
@@ -1,5 +1,5 @@
 import re
-from datetime import datetime
+import time
 from typing import Any
 
 from beeai_framework.context import (
@@ -14,8 +14,9 @@ from beeai_framework.emitter.utils import create_internal_event_matcher
 
 class MetricsMiddleware(RunMiddlewareProtocol):
     def __init__(self) -> None:
-        self.start_time: datetime | None = None
-        self.end_time: datetime | None = None
+        # monotonic timestamps in nanoseconds, see `time.perf_counter_ns()`
+        self.start_time: int | None = None
+        self.end_time: int | None = None
         self.tool_calls: int = 0
         self.prompt_tokens: int = 0
         self.completion_tokens: int = 0
@@ -40,10 +41,10 @@ class MetricsMiddleware(RunMiddlewareProtocol):
         )
 
     async def _on_run_context_start(self, event: RunContextStartEvent, meta: EventMeta) -> None:
-        self.start_time = datetime.now()
+        self.start_time = time.perf_counter_ns()
 
     async def _on_run_context_finish(self, event: RunContextFinishEvent, meta: EventMeta) -> None:
-        self.end_time = datetime.now()
+        self.end_time = time.perf_counter_ns()
         output = event.output
         state = getattr(output, "state", None)
         if state is None:
@@ -59,8 +60,8 @@ class MetricsMiddleware(RunMiddlewareProtocol):
 
     @property
     def duration(self) -> float:
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
+        if self.start_time is not None and self.end_time is not None:
+            return (self.end_time - self.start_time) / 1e9
         return 0
 
     def get_metrics(self) -> dict:
@@ -189,7 +189,8 @@ class ReasoningAgent(BaseAgent[ReasoningAgentOutput]):
             if isinstance(override, PromptTemplate):
                 setattr(templates, name, override)
             else:
-                setattr(templates, name, override(getattr(templates, name)))
+                # factories may customize the template in place, never hand them a shared one
+                setattr(templates, name, override(getattr(templates, name).fork(None)))
         return templates
 
     async def clone(self) -> "ReasoningAgent":
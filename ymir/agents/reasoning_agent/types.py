@@ -24,17 +24,20 @@ from ymir.agents.reasoning_agent.prompts import (
 
 
 class ReasoningAgentTemplates(BaseModel):
+    # the system prompt gets per-agent defaults (role, instructions), so every
+    # agent needs its own copy; the other templates are only ever rendered
+    # and can be shared instead of deep-copied for each new agent
     system: InstanceOf[PromptTemplate[ReasoningAgentSystemPromptInput]] = Field(
         default_factory=lambda: ReasoningAgentSystemPrompt.fork(None),
     )
     task: InstanceOf[PromptTemplate[ReasoningAgentTaskPromptInput]] = Field(
-        default_factory=lambda: ReasoningAgentTaskPrompt.fork(None),
+        default_factory=lambda: ReasoningAgentTaskPrompt,
     )
     tool_error: InstanceOf[PromptTemplate[ReasoningAgentToolErrorPromptInput]] = Field(
-        default_factory=lambda: ReasoningAgentToolErrorPrompt.fork(None),
+        default_factory=lambda: ReasoningAgentToolErrorPrompt,
     )
     tool_no_result: InstanceOf[PromptTemplate[ReasoningAgentToolNoResultTemplateInput]] = Field(
-        default_factory=lambda: ReasoningAgentToolNoResultPrompt.fork(None),
+        default_factory=lambda: ReasoningAgentToolNoResultPrompt,
     )
 
 
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import logging
 import os
 import sys
@@ -36,6 +37,7 @@ from ymir.agents.utils import (
     format_mr_triage_details,
     get_agent_execution_config,
     get_chat_model,
+    get_event_loop_factory,
     get_tool_call_checker_config,
     init_sentry,
     is_reasoning_enabled,
@@ -76,7 +78,12 @@ logger = logging.getLogger(__file__)
 redis_logger = logging.getLogger("agent.redis")
 
 
+_MCP_TOOL_NAMES = frozenset({"upload_sources", "get_maintainer_rules"})
+
+
+@functools.cache
 def get_instructions() -> str:
+    # static template, render it only once per process
     return render_template("rebase/instructions.j2")
 
 
@@ -105,7 +112,7 @@ def create_rebase_agent(mcp_tools: list[Tool], local_tool_options: dict[str, Any
             RunPackagePrepTool(options=local_tool_options),
             BuildSrpmTool(options=local_tool_options),
         ]
-        + [t for t in mcp_tools if t.name in ["upload_sources", "get_maintainer_rules"]],
+        + [t for t in mcp_tools if t.name in _MCP_TOOL_NAMES],
         memory=UnconstrainedMemory(),
         requirements=[
             ConditionalRequirement(
@@ -125,6 +132,11 @@ def create_rebase_agent(mcp_tools: list[Tool], local_tool_options: dict[str, Any
 async def main() -> None:
     init_sentry()
 
+    # start new tasks right away instead of on the next loop iteration,
+    # many of them finish without ever suspending (Python 3.12+ only)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     configure_logging(level=logging.INFO, buffer_size=int(os.getenv("LOG_BUFFER_SIZE", 0)))
     resolve_chat_model_override("rebase")
 
@@ -143,7 +155,8 @@ async def main() -> None:
         rebase_log: list[str] = Field(default_factory=list)
         rebase_result: RebaseOutputSchema | None = Field(default=None)
         attempts_remaining: int = Field(default=max_build_attempts)
-        all_files_git_to_add: set[str] = Field(default_factory=set)
+        # insertion-ordered (keys only) so files are staged in a deterministic order
+        all_files_git_to_add: dict[str, None] = Field(default_factory=dict)
         abandon_autorelease: bool = Field(default=False)
 
     async def run_workflow(
@@ -161,11 +174,15 @@ async def main() -> None:
         local_tool_options: dict[str, Any] = {"working_directory": None}
         if mock_env := get_mock_local_tool_env(jira_issue):
             local_tool_options["env"] = mock_env
+        # depends only on the target branch, so look it up once rather than
+        # on every build retry that goes back to fork_and_prepare_dist_git
+        leading_zstream_branch = await tasks.find_leading_zstream_branch(dist_git_branch)
 
         async with mcp_tools(
             os.environ["MCP_GATEWAY_URL"], call_meta={"jira_issue": jira_issue}
         ) as gateway_tools:
             rebase_agent = create_rebase_agent(gateway_tools, local_tool_options)
+            build_agent = create_build_agent(gateway_tools, local_tool_options)
             log_agent = create_log_agent(gateway_tools, local_tool_options)
 
             workflow = Workflow(State, name="RebaseWorkflow")
@@ -201,7 +218,6 @@ async def main() -> None:
                     dist_git_namespace=state.dist_git_namespace,
                 )
                 local_tool_options["working_directory"] = state.local_clone
-                state.leading_zstream_branch = await tasks.find_leading_zstream_branch(state.dist_git_branch)
                 return "run_rebase_agent"
 
             async def run_rebase_agent(state):
@@ -230,12 +246,13 @@ async def main() -> None:
                     state.rebase_log.append(state.rebase_result.status)
                     # Accumulate files from this rebase iteration
                     if state.rebase_result.files_to_git_add:
-                        state.all_files_git_to_add.update(state.rebase_result.files_to_git_add)
+                        state.all_files_git_to_add.update(dict.fromkeys(state.rebase_result.files_to_git_add))
                     return "run_build_agent"
                 return "comment_in_jira"
 
             async def run_build_agent(state):
-                build_agent = create_build_agent(gateway_tools, local_tool_options)
+                # every build attempt starts with a clean conversation
+                build_agent.memory.reset()
                 response = await build_agent.run(
                     render_template(
                         get_build_prompt(),
@@ -419,6 +436,7 @@ async def main() -> None:
                     fix_version=fix_version,
                     justification=justification,
                     triage_summary=triage_summary,
+                    leading_zstream_branch=leading_zstream_branch,
                 ),
             )
             return response.state
@@ -570,7 +588,9 @@ async def main() -> None:
                     redis_conn=redis,
                 )
             except Exception as e:
-                error = "".join(traceback.format_exception(e))
+                # keep the innermost frames only, the outer ones are the same
+                # workflow/asyncio plumbing for every failure
+                error = "".join(traceback.TracebackException.from_exception(e, limit=-20).format())
                 logger.error(f"Exception during rebase processing for {rebase_data.jira_issue}: {error}")
                 reason = e.explain() if isinstance(e, FrameworkError) else e
                 await retry(
@@ -581,22 +601,25 @@ async def main() -> None:
             else:
                 if state.rebase_result.success:
                     logger.info(f"Rebase successful for {rebase_data.jira_issue}, adding to completed list")
-                    await tasks.set_jira_labels(
-                        jira_issue=rebase_data.jira_issue,
-                        labels_to_add=[JiraLabels.REBASED.value],
-                        labels_to_remove=[
-                            JiraLabels.TRIAGED_REBASE.value,
-                            JiraLabels.REBASE_ERRORED.value,
-                            JiraLabels.REBASE_FAILED.value,
-                        ],
-                        dry_run=dry_run,
-                        user_triggered=user_triggered,
-                    )
-                    await fix_await(
-                        redis.lpush(
-                            RedisQueues.COMPLETED_REBASE_LIST.value,
-                            state.rebase_result.model_dump_json(),
-                        )
+                    # the Jira update and the Redis push are independent, overlap them
+                    await asyncio.gather(
+                        tasks.set_jira_labels(
+                            jira_issue=rebase_data.jira_issue,
+                            labels_to_add=[JiraLabels.REBASED.value],
+                            labels_to_remove=[
+                                JiraLabels.TRIAGED_REBASE.value,
+                                JiraLabels.REBASE_ERRORED.value,
+                                JiraLabels.REBASE_FAILED.value,
+                            ],
+                            dry_run=dry_run,
+                            user_triggered=user_triggered,
+                        ),
+                        fix_await(
+                            redis.lpush(
+                                RedisQueues.COMPLETED_REBASE_LIST.value,
+                                state.rebase_result.model_dump_json(),
+                            )
+                        ),
                     )
                 else:
                     logger.warning(f"Rebase failed for {rebase_data.jira_issue}: {state.rebase_result.error}")
@@ -635,7 +658,8 @@ if __name__ == "__main__":
         # uncomment for debugging
         # from utils import set_litellm_debug
         # set_litellm_debug()
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=get_event_loop_factory()) as runner:
+            runner.run(main())
     except FrameworkError as e:
         traceback.print_exc()
         sys.exit(e.explain())
@@ -1,4 +1,6 @@
 import asyncio
+import contextlib
+import functools
 import hashlib
 import logging
 import os
@@ -46,6 +48,23 @@ from ymir.tools.unprivileged.wicked_git import RunPackagePrepTool
 logger = logging.getLogger(__name__)
 
 
+@functools.cache
+def _resolve_basepath(value: str) -> Path:
+    return Path(value).resolve()
+
+
+def get_git_repo_basepath() -> Path:
+    """Return the resolved base directory for local clones (``$GIT_REPO_BASEPATH``).
+
+    The path is normalized only once per distinct value of the variable.
+    """
+    try:
+        value = os.environ["GIT_REPO_BASEPATH"]
+    except KeyError:
+        raise RuntimeError("GIT_REPO_BASEPATH environment variable is not set") from None
+    return _resolve_basepath(value)
+
+
 class ZStreamBranchStaleError(Exception):
     """Raised when a z-stream branch is behind the latest Brew build."""
 
@@ -187,7 +206,8 @@ async def needs_zstream_target_label(dist_git_branch: str, fix_version: str | No
 async def _clone_fedora_dist_git(package: str, destination: Path) -> bool:
     try:
         if destination.is_dir():
-            shutil.rmtree(destination, ignore_errors=False)
+            # off the event loop, this runs alongside the RHEL dist-git clone
+            await asyncio.to_thread(shutil.rmtree, destination, ignore_errors=False)
         await check_subprocess(
             [
                 "git",
@@ -195,6 +215,9 @@ async def _clone_fedora_dist_git(package: str, destination: Path) -> bool:
                 "--single-branch",
                 "--branch",
                 "rawhide",
+                # only used as a reference for the current packaging, skip the history
+                "--depth",
+                "1",
                 f"https://src.fedoraproject.org/rpms/{package}",
                 str(destination),
             ],
@@ -205,7 +228,7 @@ async def _clone_fedora_dist_git(package: str, destination: Path) -> bool:
     return True
 
 
-def _force_rmtree(path: Path | str) -> None:
+async def _force_rmtree(path: Path | str) -> None:
     """Best-effort removal of a directory tree.
 
     In containerised setups the MCP gateway (running as a different UID)
@@ -213,13 +236,13 @@ def _force_rmtree(path: Path | str) -> None:
     ``rm -rf`` and tolerate partial failures — the subsequent clone will
     reinitialise the git state over any leftover files.
     """
-    result = subprocess.run(["rm", "-rf", str(path)], capture_output=True)  # noqa: S603, S607
-    if result.returncode != 0:
+    exit_code, _, stderr = await run_subprocess(["rm", "-rf", str(path)])
+    if exit_code != 0:
         logger.warning(
             "Could not fully remove %s (exit %d): %s — proceeding anyway",
             path,
-            result.returncode,
-            result.stderr.decode().strip(),
+            exit_code,
+            (stderr or "").strip(),
         )
 
 
@@ -233,47 +256,56 @@ async def fork_and_prepare_dist_git(
 ) -> tuple[Path, str, str, Path | None]:
     if not jira_issue or Path(jira_issue).is_absolute() or ".." in jira_issue:
         raise ValueError(f"Invalid jira_issue: {jira_issue}")
-    working_dir = Path(os.environ["GIT_REPO_BASEPATH"]) / jira_issue
+    working_dir = get_git_repo_basepath() / jira_issue
     if working_dir.is_dir():
-        _force_rmtree(working_dir)
+        await _force_rmtree(working_dir)
     working_dir.mkdir(parents=True, exist_ok=True)
     namespace = resolve_dist_git_namespace(dist_git_branch, dist_git_namespace)
     repository = f"https://gitlab.com/redhat/{namespace}/rpms/{package}"
-    fork_url = await run_tool("fork_repository", repository=repository, available_tools=available_tools)
-    local_clone = working_dir / package
-    # create_zstream_branch only applies to plain internal rhel-X.Y[.0] branches;
-    # modular stream-* branches already exist in the rhel project.
-    if not is_cs_branch(dist_git_branch) and not is_modular_branch(dist_git_branch):
-        await run_tool(
-            "create_zstream_branch",
-            package=package,
-            branch=dist_git_branch,
-            available_tools=available_tools,
-        )
-    if await is_older_zstream(dist_git_branch):
-        await run_tool(
-            "clone_repository",
-            repository=repository,
-            clone_path=str(local_clone),
-            available_tools=available_tools,
-        )
-        await check_subprocess(["git", "checkout", dist_git_branch], cwd=local_clone)
-    else:
-        await run_tool(
-            "clone_repository",
-            repository=repository,
-            branch=dist_git_branch,
-            clone_path=str(local_clone),
-            available_tools=available_tools,
-        )
-    await _check_zstream_branch_consistency(package, dist_git_branch, local_clone)
-    update_branch = f"{BRANCH_PREFIX}-{jira_issue}"
-    await check_subprocess(["git", "checkout", "-B", update_branch], cwd=local_clone)
-    fedora_clone = None
-    if with_fedora:
-        fedora_clone = working_dir / f"{package}-fedora"
-        if not await _clone_fedora_dist_git(package, fedora_clone):
-            fedora_clone = None
+    fedora_clone = working_dir / f"{package}-fedora" if with_fedora else None
+    # the Fedora clone doesn't depend on any of the steps below, run it meanwhile
+    fedora_clone_task = (
+        asyncio.create_task(_clone_fedora_dist_git(package, fedora_clone)) if fedora_clone else None
+    )
+    try:
+        fork_url = await run_tool("fork_repository", repository=repository, available_tools=available_tools)
+        local_clone = working_dir / package
+        # create_zstream_branch only applies to plain internal rhel-X.Y[.0] branches;
+        # modular stream-* branches already exist in the rhel project.
+        if not is_cs_branch(dist_git_branch) and not is_modular_branch(dist_git_branch):
+            await run_tool(
+                "create_zstream_branch",
+                package=package,
+                branch=dist_git_branch,
+                available_tools=available_tools,
+            )
+        if await is_older_zstream(dist_git_branch):
+            await run_tool(
+                "clone_repository",
+                repository=repository,
+                clone_path=str(local_clone),
+                available_tools=available_tools,
+            )
+            await check_subprocess(["git", "checkout", dist_git_branch], cwd=local_clone)
+        else:
+            await run_tool(
+                "clone_repository",
+                repository=repository,
+                branch=dist_git_branch,
+                clone_path=str(local_clone),
+                available_tools=available_tools,
+            )
+        await _check_zstream_branch_consistency(package, dist_git_branch, local_clone)
+        update_branch = f"{BRANCH_PREFIX}-{jira_issue}"
+        await check_subprocess(["git", "checkout", "-B", update_branch], cwd=local_clone)
+    except BaseException:
+        if fedora_clone_task:
+            fedora_clone_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await fedora_clone_task
+        raise
+    if fedora_clone_task and not await fedora_clone_task:
+        fedora_clone = None
     return local_clone, update_branch, fork_url, fedora_clone
 
 
@@ -309,32 +341,56 @@ async def prepare_dist_git_from_merge_request(
     available_tools: list[Tool],
     with_fedora: bool = False,
 ) -> tuple[Path, MergeRequestDetails, Path | None]:
-    working_dir = Path(os.environ["GIT_REPO_BASEPATH"]) / MERGE_REQUESTS_DIR
+    working_dir = get_git_repo_basepath() / MERGE_REQUESTS_DIR
     working_dir.mkdir(parents=True, exist_ok=True)
     local_clone = working_dir / urlparse(merge_request_url).path.replace("/", "_")
-    shutil.rmtree(local_clone, ignore_errors=True)
+    if local_clone.is_dir():
+        await asyncio.to_thread(shutil.rmtree, local_clone, ignore_errors=True)
     details = await run_tool(
         "get_merge_request_details",
         merge_request_url=merge_request_url,
         available_tools=available_tools,
     )
     details = MergeRequestDetails.model_validate(details)
-    await run_tool(
-        "clone_repository",
-        repository=details.source_repo,
-        branch=details.source_branch,
-        clone_path=str(local_clone),
-        available_tools=available_tools,
-    )
-    fedora_clone = None
-    if with_fedora:
+
+    async def clone_fedora() -> Path | None:
+        if not with_fedora:
+            return None
         package = details.target_repo_name
         fedora_clone = working_dir / f"{package}-fedora-{local_clone.name}"
         if not await _clone_fedora_dist_git(package, fedora_clone):
-            fedora_clone = None
+            return None
+        return fedora_clone
+
+    # the two clones are independent of each other, run them concurrently
+    _, fedora_clone = await asyncio.gather(
+        run_tool(
+            "clone_repository",
+            repository=details.source_repo,
+            branch=details.source_branch,
+            clone_path=str(local_clone),
+            available_tools=available_tools,
+        ),
+        clone_fedora(),
+    )
     return local_clone, details, fedora_clone
 
 
+async def get_head_commit(local_clone: Path) -> str:
+    stdout, _ = await check_subprocess(["git", "rev-parse", "HEAD"], cwd=local_clone)
+    return (stdout or "").strip()
+
+
+async def reset_local_clone(local_clone: Path, commit: str) -> None:
+    """Discard all local changes and any commits made after ``commit``.
+
+    Cheaper alternative to re-cloning when retrying on an unchanged checkout,
+    ``commit`` is the HEAD of the clone right after cloning.
+    """
+    await check_subprocess(["git", "reset", "--hard", commit], cwd=local_clone)
+    await check_subprocess(["git", "clean", "-fdx"], cwd=local_clone)
+
+
 async def update_release(
     local_clone: Path,
     package: str,
@@ -358,9 +414,16 @@ async def stage_changes(
 ) -> None:
     if isinstance(files_to_commit, str):
         files_to_commit = [files_to_commit]
+    # don't pass the same pathspec to git twice, keep the order
+    files_to_commit = list(dict.fromkeys(files_to_commit))
 
+    logger.info(f"Staging: {', '.join(files_to_commit)}")
+    exit_code, _, _ = await run_subprocess(["git", "add", "--all", *files_to_commit], cwd=local_clone)
+    if exit_code == 0:
+        return
+    # a single pathspec that matches nothing fails the whole batch,
+    # retry file by file so the rest still gets staged
     for file in files_to_commit:
-        logger.info(f"Staging: {file}")
         exit_code, _, stderr = await run_subprocess(["git", "add", "--all", file], cwd=local_clone)
         # for the case agent already staged deleted file which leads to error
         if exit_code != 0:
@@ -383,21 +446,25 @@ async def commit_and_push(
         - str: The URL of the merge request if it was created successfully
         - bool: True if the merge request was created, False otherwise (i.e. MR was reused)
     """
-    if not allow_empty:
-        # Check if any files are staged before committing, if none, bail
-        exit_code, _, _ = await run_subprocess(
-            ["git", "diff", "--cached", "--quiet"],
-            cwd=local_clone,
-        )
-        # 1 = staged, 0 = none staged
-        if exit_code == 0:
-            logger.info("No files staged for commit, halting.")
-            raise RuntimeError("No files staged for commit, halting.")
     commit_cmd = ["git", "commit"]
     if allow_empty:
         commit_cmd.append("--allow-empty")
     commit_cmd.extend(["-m", commit_message])
-    await check_subprocess(commit_cmd, cwd=local_clone)
+    exit_code, stdout, stderr = await run_subprocess(commit_cmd, cwd=local_clone)
+    if exit_code:
+        if not allow_empty:
+            # git refuses to create an empty commit, only check the index
+            # once the commit failed to tell that apart from other errors
+            diff_exit_code, _, _ = await run_subprocess(
+                ["git", "diff", "--cached", "--quiet"],
+                cwd=local_clone,
+            )
+            # 1 = staged, 0 = none staged
+            if diff_exit_code == 0:
+                logger.info("No files staged for commit, halting.")
+                raise RuntimeError("No files staged for commit, halting.")
+        logger.error(f"Failed to commit changes: {stderr or stdout}")
+        raise subprocess.CalledProcessError(exit_code, commit_cmd, stdout, stderr)
     if commit_only:
         return False
     await run_tool(
@@ -625,6 +692,7 @@ async def set_jira_labels(
     dry_run: bool = False,
     user_triggered: bool = False,
     critical: bool = False,
+    available_tools: list[Tool] | None = None,
 ) -> None:
     """Edit labels on a Jira issue.
 
@@ -633,6 +701,9 @@ async def set_jira_labels(
     failure so the caller can take recovery action (typically: re-queue the
     task and abort processing). When ``critical=False`` (default), failures
     are logged and swallowed.
+
+    ``available_tools`` lets a caller that already holds a gateway connection
+    reuse it, otherwise a new one is opened for the edit.
     """
     if dry_run or os.getenv("JIRA_DRY_RUN", "false").lower() == "true":
         logger.info(f"Dry run, not updating labels for {jira_issue}")
@@ -655,7 +726,12 @@ async def set_jira_labels(
     last_exc: Exception | None = None
     for attempt in range(1, max_attempts + 1):
         try:
-            async with mcp_tools(os.environ["MCP_GATEWAY_URL"]) as gateway_tools:
+            gateway = (
+                contextlib.nullcontext(available_tools)
+                if available_tools is not None
+                else mcp_tools(os.environ["MCP_GATEWAY_URL"])
+            )
+            async with gateway as gateway_tools:
                 await run_tool(
                     "edit_jira_labels",
                     issue_key=jira_issue,
@@ -682,6 +758,43 @@ async def set_jira_labels(
     raise last_exc  # type: ignore[misc]
 
 
+async def set_jira_labels_for_issues(
+    jira_issues: list[str],
+    labels_to_add: list[str] | None = None,
+    labels_to_remove: list[str] | None = None,
+    dry_run: bool = False,
+    user_triggered: bool = False,
+) -> None:
+    """Apply the same label edit to several Jira issues over one gateway connection.
+
+    Failures are logged and swallowed, a failed edit doesn't stop the remaining ones.
+    If the shared connection can't be opened, each issue falls back to its own connection.
+    """
+    if not jira_issues:
+        return
+    if dry_run or os.getenv("JIRA_DRY_RUN", "false").lower() == "true":
+        for jira_issue in jira_issues:
+            await set_jira_labels(jira_issue, dry_run=True)
+        return
+    try:
+        async with contextlib.AsyncExitStack() as stack:
+            try:
+                gateway_tools = await stack.enter_async_context(mcp_tools(os.environ["MCP_GATEWAY_URL"]))
+            except Exception as e:
+                logger.warning(f"Failed to open a shared gateway connection, updating labels one by one: {e}")
+                gateway_tools = None
+            for jira_issue in jira_issues:
+                await set_jira_labels(
+                    jira_issue,
+                    labels_to_add=labels_to_add,
+                    labels_to_remove=labels_to_remove,
+                    user_triggered=user_triggered,
+                    available_tools=gateway_tools,
+                )
+    except Exception as e:
+        logger.warning(f"Failed to update labels for {', '.join(jira_issues)}: {e}")
+
+
 async def cache_mr_metadata(
     redis_conn,
     log_output: LogOutputSchema,
@@ -708,24 +821,28 @@ async def cache_mr_metadata(
     details_hash = hashlib.sha256(details.encode()).hexdigest()[:16]
     cache_key = f"mr_metadata:{operation_type}:{package}:{details_hash}"
 
-    # Try to get previously cached metadata
-    cached = await redis_conn.get(cache_key)
-    if cached is not None:
-        logger.info(f"MR metadata cache HIT for {operation_type}/{package}/{details} (key: {cache_key})")
-        try:
-            metadata = CachedMRMetadata.model_validate_json(cached)
-            # Override the title by value stored in the cache
-            return LogOutputSchema(title=metadata.title, description=log_output.description)
-        except ValueError as e:
-            logger.warning(f"Error validating cached MR metadata for key {cache_key}: {e}")
-
-    # Store new metadata on cache miss or validation error
     metadata = CachedMRMetadata(
         operation_type=operation_type,
         title=log_output.title,
         package=package,
         details=details,
     )
+    # Store the metadata unless already cached, getting the cached value back
+    # in the same round-trip; concurrent streams can't overwrite each other
+    cached = await redis_conn.set(cache_key, metadata.model_dump_json(), nx=True, get=True)
+    if cached is None:
+        logger.info(f"MR metadata cache stored for {operation_type}/{package}/{details} (key: {cache_key})")
+        return log_output
+
+    logger.info(f"MR metadata cache HIT for {operation_type}/{package}/{details} (key: {cache_key})")
+    try:
+        cached_metadata = CachedMRMetadata.model_validate_json(cached)
+        # Override the title by value stored in the cache
+        return LogOutputSchema(title=cached_metadata.title, description=log_output.description)
+    except ValueError as e:
+        logger.warning(f"Error validating cached MR metadata for key {cache_key}: {e}")
+
+    # Replace metadata that failed validation
     await redis_conn.set(cache_key, metadata.model_dump_json())
     logger.info(f"MR metadata cache stored for {operation_type}/{package}/{details} (key: {cache_key})")
 
@@ -816,9 +933,9 @@ async def clone_and_prep_sources(
     """
     if not jira_issue or Path(jira_issue).is_absolute() or ".." in jira_issue:
         raise ValueError(f"Invalid jira_issue: {jira_issue}")
-    working_dir = Path(os.environ["GIT_REPO_BASEPATH"]) / APPLICABILITY_DIR / jira_issue
+    working_dir = get_git_repo_basepath() / APPLICABILITY_DIR / jira_issue
     if working_dir.is_dir():
-        _force_rmtree(working_dir)
+        await _force_rmtree(working_dir)
     working_dir.mkdir(parents=True, exist_ok=True)
     local_clone = working_dir / package
 
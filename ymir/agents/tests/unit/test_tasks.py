@@ -1,3 +1,5 @@
+import asyncio
+import subprocess
 from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, patch
 
@@ -6,16 +8,22 @@ import pytest
 from ymir.agents.tasks import (
     ZStreamBranchStaleError,
     _check_zstream_branch_consistency,
+    cache_mr_metadata,
     change_jira_status,
+    commit_and_push,
     commit_push_and_open_mr,
     fork_and_prepare_dist_git,
+    get_head_commit,
     get_jira_issue_metadata,
     handle_zstream_branch_stale_error,
     needs_zstream_target_label,
     post_user_ack_once,
+    reset_local_clone,
+    set_jira_labels_for_issues,
+    stage_changes,
 )
 from ymir.common.constants import JiraLabels, RedisQueues
-from ymir.common.models import Task
+from ymir.common.models import CachedMRMetadata, LogOutputSchema, Task
 
 
 @asynccontextmanager
@@ -122,6 +130,72 @@ async def test_fork_and_prepare_modular_rhel_skips_create_zstream_branch(git_rep
     assert "create_zstream_branch" not in tool_names
 
 
+@pytest.mark.asyncio
+async def test_fork_and_prepare_clones_fedora_alongside_dist_git(git_repo_basepath):
+    fedora_started = asyncio.Event()
+
+    async def clone_fedora(package, destination):
+        fedora_started.set()
+        return True
+
+    async def run_tool(name, **kwargs):
+        if name == "clone_repository":
+            # the Fedora clone must not wait for the dist-git clone
+            await asyncio.wait_for(fedora_started.wait(), timeout=1)
+        return "https://fork.example.com"
+
+    with (
+        patch("ymir.agents.tasks.run_tool", side_effect=run_tool),
+        patch("ymir.agents.tasks.check_subprocess", new_callable=AsyncMock),
+        patch("ymir.agents.tasks.is_older_zstream", new_callable=AsyncMock, return_value=False),
+        patch("ymir.agents.tasks._check_zstream_branch_consistency", new_callable=AsyncMock),
+        patch("ymir.agents.tasks._clone_fedora_dist_git", side_effect=clone_fedora),
+    ):
+        _, _, _, fedora_clone = await fork_and_prepare_dist_git(
+            jira_issue="RHEL-12345",
+            package="some-package",
+            dist_git_branch="c10s",
+            available_tools=[AsyncMock()],
+            with_fedora=True,
+        )
+
+    assert fedora_clone == git_repo_basepath / "RHEL-12345" / "some-package-fedora"
+
+
+@pytest.mark.asyncio
+async def test_fork_and_prepare_cancels_fedora_clone_on_failure(git_repo_basepath):
+    fedora_started = asyncio.Event()
+    fedora_cancelled = asyncio.Event()
+
+    async def clone_fedora(package, destination):
+        fedora_started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            fedora_cancelled.set()
+            raise
+        return True
+
+    async def run_tool(name, **kwargs):
+        await fedora_started.wait()
+        raise RuntimeError("fork failed")
+
+    with (
+        patch("ymir.agents.tasks.run_tool", side_effect=run_tool),
+        patch("ymir.agents.tasks._clone_fedora_dist_git", side_effect=clone_fedora),
+        pytest.raises(RuntimeError, match="fork failed"),
+    ):
+        await fork_and_prepare_dist_git(
+            jira_issue="RHEL-12345",
+            package="some-package",
+            dist_git_branch="c10s",
+            available_tools=[AsyncMock()],
+            with_fedora=True,
+        )
+
+    assert fedora_cancelled.is_set()
+
+
 @pytest.mark.asyncio
 async def test_post_user_ack_once_posts_on_first_call():
     """User-triggered, not dry-run, never posted → posts and persists the flag."""
@@ -463,6 +537,75 @@ async def test_commit_push_and_open_mr_no_reviewers_without_package(tmp_path):
     assert len(reviewer_calls) == 0
 
 
+@pytest.mark.asyncio
+async def test_stage_changes_adds_all_files_at_once(tmp_path):
+    with patch(
+        "ymir.agents.tasks.run_subprocess", new_callable=AsyncMock, return_value=(0, None, None)
+    ) as run:
+        await stage_changes(tmp_path, ["bash.spec", "bash-fix.patch", "bash.spec"])
+
+    run.assert_awaited_once_with(["git", "add", "--all", "bash.spec", "bash-fix.patch"], cwd=tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_stage_changes_falls_back_to_single_files(tmp_path):
+    with patch(
+        "ymir.agents.tasks.run_subprocess",
+        new_callable=AsyncMock,
+        side_effect=[
+            (128, None, "pathspec 'gone.patch' did not match any files"),  # batch
+            (0, None, None),  # bash.spec
+            (128, None, "pathspec 'gone.patch' did not match any files"),  # gone.patch
+        ],
+    ) as run:
+        await stage_changes(tmp_path, ["bash.spec", "gone.patch"])
+
+    assert [call.args[0] for call in run.await_args_list] == [
+        ["git", "add", "--all", "bash.spec", "gone.patch"],
+        ["git", "add", "--all", "bash.spec"],
+        ["git", "add", "--all", "gone.patch"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_commit_and_push_commits_without_probing_index(tmp_path):
+    with patch(
+        "ymir.agents.tasks.run_subprocess", new_callable=AsyncMock, return_value=(0, None, None)
+    ) as run:
+        pushed = await commit_and_push(tmp_path, "Update", "fork", "branch", [], commit_only=True)
+
+    assert pushed is False
+    run.assert_awaited_once_with(["git", "commit", "-m", "Update"], cwd=tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_commit_and_push_halts_when_nothing_staged(tmp_path):
+    with (
+        patch(
+            "ymir.agents.tasks.run_subprocess",
+            new_callable=AsyncMock,
+            side_effect=[(1, "nothing to commit, working tree clean", None), (0, None, None)],
+        ) as run,
+        pytest.raises(RuntimeError, match="No files staged"),
+    ):
+        await commit_and_push(tmp_path, "Update", "fork", "branch", [])
+
+    assert run.await_args_list[1].args[0] == ["git", "diff", "--cached", "--quiet"]
+
+
+@pytest.mark.asyncio
+async def test_commit_and_push_reports_commit_failure(tmp_path):
+    with (
+        patch(
+            "ymir.agents.tasks.run_subprocess",
+            new_callable=AsyncMock,
+            side_effect=[(1, None, "hook failed"), (1, None, None)],
+        ),
+        pytest.raises(subprocess.CalledProcessError),
+    ):
+        await commit_and_push(tmp_path, "Update", "fork", "branch", [])
+
+
 @pytest.mark.asyncio
 async def test_zstream_consistency_stale_not_ancestor(tmp_path):
     """Branch HEAD does not contain the build ref (exit 1) -> stale."""
@@ -614,6 +757,63 @@ async def test_zstream_consistency_unexpected_git_exit_soft_fails(tmp_path, capl
     assert "Unexpected git merge-base exit 2" in caplog.text
 
 
+@pytest.mark.asyncio
+async def test_set_jira_labels_for_issues_shares_gateway_connection():
+    connections = 0
+
+    @asynccontextmanager
+    async def counting_mcp_tools(_url, **_kwargs):
+        nonlocal connections
+        connections += 1
+        yield []
+
+    with (
+        patch("ymir.agents.tasks.mcp_tools", counting_mcp_tools),
+        patch("ymir.agents.tasks.run_tool", new_callable=AsyncMock) as run_tool,
+    ):
+        await set_jira_labels_for_issues(
+            ["RHEL-1", "RHEL-2", "RHEL-3"],
+            labels_to_add=[JiraLabels.TRIAGED_REBUILD.value],
+            labels_to_remove=[JiraLabels.REBUILT.value],
+        )
+
+    assert connections == 1
+    assert [call.kwargs["issue_key"] for call in run_tool.await_args_list] == ["RHEL-1", "RHEL-2", "RHEL-3"]
+
+
+@pytest.mark.asyncio
+async def test_set_jira_labels_for_issues_falls_back_to_per_issue_connections():
+    connections = 0
+
+    @asynccontextmanager
+    async def flaky_mcp_tools(_url, **_kwargs):
+        nonlocal connections
+        connections += 1
+        if connections == 1:
+            raise ConnectionError("gateway unavailable")
+        yield []
+
+    with (
+        patch("ymir.agents.tasks.mcp_tools", flaky_mcp_tools),
+        patch("ymir.agents.tasks.run_tool", new_callable=AsyncMock) as run_tool,
+    ):
+        await set_jira_labels_for_issues(
+            ["RHEL-1", "RHEL-2"],
+            labels_to_add=[JiraLabels.TRIAGED_REBUILD.value],
+        )
+
+    assert connections == 3
+    assert [call.kwargs["issue_key"] for call in run_tool.await_args_list] == ["RHEL-1", "RHEL-2"]
+
+
+@pytest.mark.asyncio
+async def test_set_jira_labels_for_issues_dry_run_skips_gateway():
+    with patch("ymir.agents.tasks.mcp_tools") as mcp:
+        await set_jira_labels_for_issues(["RHEL-1"], labels_to_add=["x"], dry_run=True)
+
+    mcp.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_handle_zstream_branch_stale_error_labels_comments_and_error_list():
     exc = ZStreamBranchStaleError("golang", "rhel-9.8.0", "build-ref-sha", "branch-head-sha")
@@ -677,3 +877,68 @@ async def test_handle_zstream_branch_stale_error_skips_comment_on_dry_run():
     mock_labels.assert_awaited_once()
     mock_comment.assert_not_awaited()
     redis.lpush.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cache_mr_metadata_stores_on_miss():
+    redis = AsyncMock()
+    redis.set = AsyncMock(return_value=None)
+    log_output = LogOutputSchema(title="Rebase to 1.2", description="desc")
+
+    result = await cache_mr_metadata(redis, log_output, "rebase", "bash", "1.2")
+
+    assert result == log_output
+    redis.set.assert_awaited_once()
+    assert redis.set.await_args.kwargs == {"nx": True, "get": True}
+    assert CachedMRMetadata.model_validate_json(redis.set.await_args.args[1]).title == "Rebase to 1.2"
+
+
+@pytest.mark.asyncio
+async def test_cache_mr_metadata_returns_cached_title():
+    cached = CachedMRMetadata(operation_type="rebase", title="Cached title", package="bash", details="1.2")
+    redis = AsyncMock()
+    redis.set = AsyncMock(return_value=cached.model_dump_json().encode())
+    log_output = LogOutputSchema(title="Rebase to 1.2", description="desc")
+
+    result = await cache_mr_metadata(redis, log_output, "rebase", "bash", "1.2")
+
+    assert result == LogOutputSchema(title="Cached title", description="desc")
+    redis.set.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cache_mr_metadata_replaces_invalid_entry():
+    redis = AsyncMock()
+    redis.set = AsyncMock(side_effect=[b"not json", True])
+    log_output = LogOutputSchema(title="Rebase to 1.2", description="desc")
+
+    result = await cache_mr_metadata(redis, log_output, "rebase", "bash", "1.2")
+
+    assert result == log_output
+    assert redis.set.await_count == 2
+    assert redis.set.await_args.kwargs == {}
+
+
+@pytest.mark.asyncio
+async def test_reset_local_clone_drops_agent_commits(tmp_path, monkeypatch):
+    for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(var, "Test")
+    for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(var, "test@test.com")
+    subprocess.run(["git", "init"], cwd=tmp_path, check=True)
+    (tmp_path / "package.spec").write_text("original\n")
+    subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+    subprocess.run(["git", "commit", "-m", "Initial"], cwd=tmp_path, check=True)
+    cloned_head = await get_head_commit(tmp_path)
+
+    # the agent commits one change and leaves others uncommitted
+    (tmp_path / "package.spec").write_text("committed\n")
+    subprocess.run(["git", "commit", "-am", "Agent commit"], cwd=tmp_path, check=True)
+    (tmp_path / "package.spec").write_text("uncommitted\n")
+    (tmp_path / "untracked.patch").write_text("patch\n")
+
+    await reset_local_clone(tmp_path, cloned_head)
+
+    assert await get_head_commit(tmp_path) == cloned_head
+    assert (tmp_path / "package.spec").read_text() == "original\n"
+    assert not (tmp_path / "untracked.patch").exists()
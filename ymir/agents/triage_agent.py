@@ -942,7 +942,7 @@ async def run_workflow(
             return "comment_in_jira"
 
         async def comment_in_jira(state):
-            applicability_dir = Path(os.environ["GIT_REPO_BASEPATH"]) / APPLICABILITY_DIR / state.jira_issue
+            applicability_dir = tasks.get_git_repo_basepath() / APPLICABILITY_DIR / state.jira_issue
             if applicability_dir.exists():
                 shutil.rmtree(applicability_dir, ignore_errors=True)
                 state.applicability_local_clone = None
@@ -1072,24 +1072,16 @@ async def main() -> None:
                             e,
                         )
                     if output.resolution == Resolution.REBUILD:
-                        for consolidated in output.data.consolidated_issues:
-                            try:
-                                await tasks.set_jira_labels(
-                                    jira_issue=consolidated.issue_key,
-                                    labels_to_add=[JiraLabels.TRIAGED_REBUILD.value],
-                                    labels_to_remove=[
-                                        JiraLabels.TRIAGE_IN_PROGRESS.value,
-                                        JiraLabels.REBUILT.value,
-                                    ],
-                                    dry_run=dry_run,
-                                    user_triggered=True,
-                                )
-                            except Exception as e:
-                                logger.warning(
-                                    "Failed to set labels on consolidated issue %s: %s",
-                                    consolidated.issue_key,
-                                    e,
-                                )
+                        await tasks.set_jira_labels_for_issues(
+                            [consolidated.issue_key for consolidated in output.data.consolidated_issues],
+                            labels_to_add=[JiraLabels.TRIAGED_REBUILD.value],
+                            labels_to_remove=[
+                                JiraLabels.TRIAGE_IN_PROGRESS.value,
+                                JiraLabels.REBUILT.value,
+                            ],
+                            dry_run=dry_run,
+                            user_triggered=True,
+                        )
 
             return
 
@@ -1306,23 +1298,16 @@ async def main() -> None:
                         user_triggered=user_triggered,
                     )
                     if output.resolution == Resolution.REBUILD:
-                        for consolidated in output.data.consolidated_issues:
-                            try:
-                                await tasks.set_jira_labels(
-                                    jira_issue=consolidated.issue_key,
-                                    labels_to_add=[JiraLabels.TRIAGED_REBUILD.value],
-                                    labels_to_remove=[
-                                        JiraLabels.TRIAGE_IN_PROGRESS.value,
-                                        JiraLabels.REBUILT.value,
-                                    ],
-                                    dry_run=dry_run,
-                                    user_triggered=user_triggered,
-                                )
-                            except Exception as e:
-                                logger.warning(
-                                    f"Failed to set labels on consolidated issue "
-                                    f"{consolidated.issue_key}: {e}"
-                                )
+                        await tasks.set_jira_labels_for_issues(
+                            [consolidated.issue_key for consolidated in output.data.consolidated_issues],
+                            labels_to_add=[JiraLabels.TRIAGED_REBUILD.value],
+                            labels_to_remove=[
+                                JiraLabels.TRIAGE_IN_PROGRESS.value,
+                                JiraLabels.REBUILT.value,
+                            ],
+                            dry_run=dry_run,
+                            user_triggered=user_triggered,
+                        )
 
                 if output.resolution == Resolution.ERROR:
                     await retry(task, output.data.model_dump_json())
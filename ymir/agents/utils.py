@@ -1,12 +1,15 @@
+import asyncio
+import functools
 import logging
 import os
 from collections.abc import Callable
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
+from beeai_framework.agents import AgentOutput
 from beeai_framework.agents.tool_calling.utils import ToolCallCheckerConfig
 from beeai_framework.backend import ChatModel, ChatModelParameters
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, Template
 from pydantic import BaseModel
 
 from ymir.common.base_utils import check_subprocess, run_subprocess  # noqa: F401 — re-exported
@@ -18,6 +21,8 @@ from ymir.common.utils import get_absolute_path, mcp_tools, run_tool  # noqa: F4
 
 logger = logging.getLogger(__name__)
 
+_OutputSchema = TypeVar("_OutputSchema", bound=BaseModel)
+
 
 def resolve_chat_model_override(agent_type: str) -> None:
     """Override CHAT_MODEL with a per-agent value if set.
@@ -90,6 +95,19 @@ def get_agent_execution_config() -> dict[str, int]:
     }
 
 
+def parse_agent_output(response: AgentOutput, schema: type[_OutputSchema]) -> _OutputSchema:
+    """Return the final answer of an agent run as an instance of *schema*.
+
+    The final answer tool validates its input against the expected output
+    schema already, so the structured result is reused as-is instead of
+    validating the serialized message text again.  Falls back to parsing
+    the text if no structured result of the right type is available.
+    """
+    if isinstance(response.output_structured, schema):
+        return response.output_structured
+    return schema.model_validate_json(response.last_message.text)
+
+
 def get_tool_call_checker_config() -> ToolCallCheckerConfig:
     return ToolCallCheckerConfig(
         # allow two consecutive identical tool calls
@@ -110,6 +128,8 @@ def _get_jinja2_env(template_dir: Path) -> Environment:
     if key not in _jinja2_envs:
         _jinja2_envs[key] = Environment(
             loader=FileSystemLoader(resolved_dir),
+            # prompts ship with the package, no need to stat them on every render
+            auto_reload=False,
             autoescape=False,  # noqa: S701 — LLM prompts, not HTML
             keep_trailing_newline=True,
             trim_blocks=True,
@@ -118,6 +138,13 @@ def _get_jinja2_env(template_dir: Path) -> Environment:
     return _jinja2_envs[key]
 
 
+@functools.cache
+def _get_template(template_dir: Path, template_name: str) -> Template:
+    # parse each prompt once; rendering then skips the path resolution
+    # and the environment's template cache lookup
+    return _get_jinja2_env(template_dir).get_template(template_name)
+
+
 def render_template(
     template_name: str,
     input: BaseModel | None = None,
@@ -129,8 +156,7 @@ def render_template(
     When *input* is ``None`` the template is loaded as-is (useful for static
     instruction prompts that contain no Jinja2 variables).
     """
-    env = _get_jinja2_env(template_dir)
-    template = env.get_template(template_name)
+    template = _get_template(template_dir, template_name)
     return template.render(input.model_dump(mode="json") if input else {})
 
 
@@ -211,6 +237,18 @@ def format_mr_triage_details(
     return ""
 
 
+def get_event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Return a factory for uvloop's event loop, if uvloop is installed.
+
+    ``None`` means the default asyncio event loop should be used.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 def init_sentry() -> None:
     """Initialize Sentry, if the DSN is set."""
     if not (dsn := os.getenv("SENTRY_DSN")):
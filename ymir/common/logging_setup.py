@@ -1,10 +1,13 @@
 """Shared logging configuration for ymir entry points."""
 
+import atexit
 import logging
+import queue
 import sys
 import threading
 from collections.abc import Iterable
 from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 
 LOG_FORMAT = "%(asctime)s [%(levelname)s] %(name)s:%(jira_issue)s %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
@@ -13,6 +16,7 @@ current_jira_issue: ContextVar[str | None] = ContextVar("current_jira_issue", de
 current_workflow: ContextVar[str | None] = ContextVar("current_workflow", default=None)
 
 _buffered_handler: "BufferedTaskHandler | None" = None
+_queue_listener: QueueListener | None = None
 
 
 class _JiraFormatter(logging.Formatter):
@@ -88,6 +92,16 @@ class BufferedTaskHandler(logging.Handler):
             sys.stdout.flush()
 
 
+def _stop_queue_listener() -> None:
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+atexit.register(_stop_queue_listener)
+
+
 class _LogWriteable:
     """Adapter routing `write()` calls through Python logging.
 
@@ -135,12 +149,18 @@ def configure_logging(
     When `buffer_size` > 0, log lines emitted inside a task context
     (`current_jira_issue` set) are buffered per issue and flushed in
     contiguous batches of up to `buffer_size` lines.
+
+    Otherwise the output handlers are driven by a background
+    `QueueListener`, so logging calls from concurrently running tasks
+    don't serialize on the stream lock.
     """
-    global _buffered_handler
+    global _buffered_handler, _queue_listener
 
+    _stop_queue_listener()
     formatter = _JiraFormatter(fmt=LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
 
     if buffer_size > 0:
+        # buffering needs the task context at emit time, keep it synchronous
         _buffered_handler = BufferedTaskHandler(buffer_size=buffer_size)
         handlers: list[logging.Handler] = [_buffered_handler]
     else:
@@ -149,6 +169,15 @@ def configure_logging(
 
     if extra_handlers:
         handlers.extend(extra_handlers)
+
+    if _buffered_handler is None:
+        # QueueHandler formats records in the emitting task's context (needed
+        # for `current_jira_issue`), the listener only writes them out
+        queue_handler = QueueHandler(queue.SimpleQueue())
+        _queue_listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        _queue_listener.start()
+        handlers = [queue_handler]
+
     for handler in handlers:
         handler.setFormatter(formatter)
 
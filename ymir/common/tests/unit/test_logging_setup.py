@@ -0,0 +1,51 @@
+import asyncio
+import logging
+
+import pytest
+
+from ymir.common import logging_setup
+from ymir.common.logging_setup import configure_logging, current_jira_issue
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines: list[str] = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    logging_setup._stop_queue_listener()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+@pytest.mark.asyncio
+async def test_queued_logging_keeps_task_context(restore_root_logger):
+    handler = ListHandler()
+    configure_logging(extra_handlers=[handler])
+    assert logging_setup._queue_listener is not None
+
+    async def task(issue):
+        current_jira_issue.set(issue)
+        logging.getLogger("test").info("processing")
+
+    await asyncio.gather(task("RHEL-1"), task("RHEL-2"))
+    logging_setup._stop_queue_listener()
+
+    assert sorted(line.split(" ", 3)[-1] for line in handler.lines) == [
+        "test: [RHEL-1] processing",
+        "test: [RHEL-2] processing",
+    ]
+
+
+def test_buffered_logging_is_not_queued(restore_root_logger):
+    configure_logging(buffer_size=10)
+    assert logging_setup._queue_listener is None
+    assert logging.getLogger().handlers == [logging_setup._buffered_handler]
@@ -466,6 +466,8 @@ async def test_mcp_tools_non_connection_error_raises_immediately():
 
 
 def _mock_koji_session(list_tagged_results, get_build_result):
+    # don't reuse sessions created by earlier tests
+    _ymir_utils._koji_sessions.clear()
     flexmock(koji).should_receive("ClientSession").and_return(
         flexmock(
             listTagged=lambda **kw: list_tagged_results.get(kw["tag"], []),
@@ -4,6 +4,7 @@ Common utility functions shared across the BeeAI system.
 
 import asyncio
 import logging
+import threading
 from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
 from datetime import timedelta
@@ -185,9 +186,22 @@ def get_all_patches(spec: Specfile) -> Patches:
     return Patches(spec.tags(parsed_sections.package).content, patchlists, context=spec)
 
 
+# keyed by (thread ID, hub URL): sessions aren't thread-safe, but reusing one per
+# executor thread keeps its connection alive across consecutive calls
+_koji_sessions: dict[tuple[int, str], koji.ClientSession] = {}
+
+
+def _get_koji_session(koji_url: str) -> koji.ClientSession:
+    """Return a Koji session for *koji_url* owned by the calling thread."""
+    key = (threading.get_ident(), koji_url)
+    if (session := _koji_sessions.get(key)) is None:
+        session = _koji_sessions[key] = koji.ClientSession(koji_url)
+    return session
+
+
 def _get_latest_koji_build(koji_url: str, tag: str, package: str) -> dict | None:
     """Query a single Koji tag for the latest build of *package*."""
-    builds = koji.ClientSession(koji_url).listTagged(
+    builds = _get_koji_session(koji_url).listTagged(
         package=package,
         tag=tag,
         latest=True,
@@ -199,7 +213,7 @@ def _get_latest_koji_build(koji_url: str, tag: str, package: str) -> dict | None
 
 def _get_koji_build(koji_url: str, nvr: str) -> dict | None:
     """Look up a build by NVR on the given Koji instance."""
-    return koji.ClientSession(koji_url).getBuild(nvr)
+    return _get_koji_session(koji_url).getBuild(nvr)
 
 
 async def _get_latest_build_from_tags(
@@ -219,8 +233,9 @@ async def _get_latest_build_from_tags(
     if latest is None:
         raise RuntimeError(f"There are no builds of {package} in {' or '.join(tags)}")
     evr, build_id = latest
-    session = koji.ClientSession(BREWHUB_URL)
-    metadata = await asyncio.to_thread(session.getBuild, build_id, strict=True)
+    metadata = await asyncio.to_thread(
+        lambda: _get_koji_session(BREWHUB_URL).getBuild(build_id, strict=True),
+    )
     source_ref = metadata["source"].split("#")[-1]
     return evr, source_ref
 
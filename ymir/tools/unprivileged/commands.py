@@ -1,7 +1,8 @@
 import asyncio
+import itertools
 import json
-import math
 import os
+import re
 import shlex
 
 from beeai_framework.context import RunContext
@@ -16,6 +17,10 @@ TIMEOUT = 10 * 60  # seconds
 ELLIPSIZED_LINES = 200
 URL_FETCH_COMMANDS = ["curl", "wget"]
 
+# the same line boundaries as str.splitlines
+_LINE_BREAK_RE = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+_ELLIPSIZE_WINDOW = 64 * 1024  # characters
+
 
 def _get_blocked_urls() -> list[str]:
     """Return the list of blocked URL prefixes from ``MOCK_BLOCKED_URLS``.
@@ -61,6 +66,36 @@ def _check_blocked_urls(command: str, blocked_urls: list[str]) -> str | None:
     return None
 
 
+def _ellipsize(output: str) -> str:
+    """Keep only the first and last lines of a long command output.
+
+    Lines are delimited the same way as ``str.splitlines``, so ``\r``-separated
+    progress output is shortened too. The cut points are found by scanning in
+    from both ends, only the kept parts of the output are copied.
+    """
+    head_lines = (ELLIPSIZED_LINES - 1) // 2
+    tail_lines = ELLIPSIZED_LINES - 1 - head_lines
+    head_breaks = [match.end() for match in itertools.islice(_LINE_BREAK_RE.finditer(output), head_lines)]
+    if len(head_breaks) < head_lines:
+        return output
+    head_end = head_breaks[-1]
+    # split a growing window at the end of the output until it holds more than
+    # the kept tail lines, the first line of the window may be incomplete
+    window = _ELLIPSIZE_WINDOW
+    while True:
+        start = max(len(output) - window, head_end)
+        lines = output[start:].splitlines(keepends=True)
+        if len(lines) > tail_lines or start == head_end:
+            break
+        window *= 2
+    tail_start = len(output) - sum(map(len, lines[-tail_lines:]))
+    # nothing to leave out unless at least two lines are between the kept parts
+    match = _LINE_BREAK_RE.search(output, head_end, tail_start)
+    if match is None or match.end() == tail_start:
+        return output
+    return output[:head_end] + "[...]\n" + output[tail_start:]
+
+
 class RunShellCommandToolInput(BaseModel):
     command: str = Field(description="Command to run")
     full_output: bool = Field(
@@ -132,16 +167,7 @@ class RunShellCommandTool(Tool[RunShellCommandToolInput, ToolRunOptions, RunShel
                 return None
             if tool_input.full_output:
                 return output
-            lines = output.splitlines(keepends=True)
-            if len(lines) <= ELLIPSIZED_LINES:
-                return output
-            return "".join(
-                [
-                    *lines[: math.floor((ELLIPSIZED_LINES - 1) / 2)],
-                    "[...]\n",
-                    *lines[-math.ceil((ELLIPSIZED_LINES - 1) / 2) :],
-                ]
-            )
+            return _ellipsize(output)
 
         result = {
             "exit_code": exit_code,
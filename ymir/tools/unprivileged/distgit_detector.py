@@ -1,4 +1,4 @@
-from urllib.parse import urlparse
+import re
 
 from beeai_framework.context import RunContext
 from beeai_framework.emitter import Emitter
@@ -7,6 +7,20 @@ from pydantic import BaseModel, Field
 
 from ymir.tools.base import CloneableTool as Tool
 
+# Fedora and RHEL dist-git hosts, or the RHEL/CentOS Stream rpms namespaces on GitLab;
+# the host must be followed by a port, a path or the end so look-alike domains don't match
+_DISTGIT_URL_RE = re.compile(
+    r"""
+    ^[a-z][a-z0-9+.-]*://                                   # scheme
+    (?:[^/?#@]*@)?                                          # userinfo
+    (?:
+        (?:src\.fedoraproject\.org|pkgs\.devel\.redhat\.com)(?::\d*)?(?:[/?#]|$)
+      | gitlab\.com(?::\d*)?/(?:[^?#]*/)?redhat/(?:centos-stream|rhel)/rpms/
+    )
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
 
 class DistgitDetectorInput(BaseModel):
     url: str = Field(description="URL to check if it's from a dist-git source")
@@ -44,29 +58,7 @@ class DistgitDetectorTool(Tool[DistgitDetectorInput, ToolRunOptions, DistgitDete
 
     def _check_distgit_source(self, url: str) -> bool:
         """Check if URL is from a dist-git source"""
-        try:
-            parsed = urlparse(url.lower())
-            hostname = parsed.hostname or ""
-            path = parsed.path.lower()
-
-            # Fedora dist-git
-            if hostname == "src.fedoraproject.org":
-                return True
-
-            # RHEL dist-git
-            if hostname == "pkgs.devel.redhat.com":
-                return True
-
-            # RHEL/CentOS Stream GitLab
-            if hostname == "gitlab.com":
-                return "/redhat/centos-stream/rpms/" in path or "/redhat/rhel/rpms/" in path
-
-            # Not a recognized dist-git source
-            return False
-
-        except Exception:
-            # If URL cannot be parsed, assume not dist-git
-            return False
+        return _DISTGIT_URL_RE.match(url) is not None
 
     async def _run(
         self,
@@ -114,21 +114,25 @@ class GetPackageInfoTool(Tool[GetPackageInfoToolInput, ToolRunOptions, GetPackag
         spec_path = get_absolute_path(tool_input.spec, self)
 
         try:
-            with Specfile(spec_path) as spec:
-                version = spec.version
-                valid_patches = [p for p in get_all_patches(spec) if p.valid and p.expanded_location]
-                patch_files = [p.expanded_location for p in valid_patches]
-                number_to_filename = {p.number: p.expanded_location for p in valid_patches}
-
-                strip_levels = _extract_strip_levels(spec, number_to_filename)
-
-                return GetPackageInfoToolOutput(
-                    result=PackageInfo(
-                        version=version,
-                        patch_files=patch_files,
-                        patch_strip_levels=strip_levels,
-                    )
+            # parse a read-only copy, entering Specfile(spec_path) would save the file back on exit
+            spec = Specfile(
+                content=spec_path.read_text(**Specfile.ENCODING_ARGS),
+                sourcedir=spec_path.parent,
+            )
+            version = spec.version
+            valid_patches = [p for p in get_all_patches(spec) if p.valid and p.expanded_location]
+            patch_files = [p.expanded_location for p in valid_patches]
+            number_to_filename = {p.number: p.expanded_location for p in valid_patches}
+
+            strip_levels = _extract_strip_levels(spec, number_to_filename)
+
+            return GetPackageInfoToolOutput(
+                result=PackageInfo(
+                    version=version,
+                    patch_files=patch_files,
+                    patch_strip_levels=strip_levels,
                 )
+            )
 
         except Exception as e:
             raise ToolError(f"Failed to extract package info from {spec_path}: {e}") from e
@@ -179,6 +183,12 @@ class AddChangelogEntryTool(Tool[AddChangelogEntryToolInput, ToolRunOptions, Str
         return StringToolOutput(result=f"Successfully added a new changelog entry to {spec_path}")
 
 
+_ZSTREAM_BRANCH_RE = re.compile(r"^(?P<prefix>rhel-(?P<x>\d+)\.)(?P<y>\d+)(?P<suffix>\.\d+)?$")
+# Z-Stream counter following the dist tag, e.g. ".2"
+_ZSTREAM_COUNTER_RE = re.compile(r"^\.(\d+)$")
+_LEADING_NUMBER_RE = re.compile(r"^(\d+)(.*)$")
+
+
 class UpdateReleaseToolInput(BaseModel):
     spec: Path = Field(description="Path to a spec file")
     package: str = Field(description="Package name")
@@ -240,12 +250,7 @@ class UpdateReleaseTool(Tool[UpdateReleaseToolInput, ToolRunOptions, StringToolO
 
     @staticmethod
     def _get_higher_stream_branch(dist_git_branch: str) -> str | None:
-        if not (
-            m := re.match(
-                r"^(?P<prefix>rhel-(?P<x>\d+)\.)(?P<y>\d+)(?P<suffix>\.\d+)?$",
-                dist_git_branch,
-            )
-        ):
+        if not (m := _ZSTREAM_BRANCH_RE.match(dist_git_branch)):
             # not a Z-Stream branch
             return None
         y = int(m.group("y"))
@@ -254,44 +259,45 @@ class UpdateReleaseTool(Tool[UpdateReleaseToolInput, ToolRunOptions, StringToolO
 
     @staticmethod
     def _find_macro(name: str, nodes: list[Node]) -> int | None:
-        for index, node in reversed(list(enumerate(nodes))):
+        for index in range(len(nodes) - 1, -1, -1):
+            node = nodes[index]
             if isinstance(node, (MacroSubstitution, EnclosedMacroSubstitution)) and node.name == name:
                 return index
         return None
 
     @classmethod
     async def _bump_or_reset_release(cls, spec_path: Path, rebase: bool) -> None:
+        # parse and save the spec only once
         with Specfile(spec_path) as spec:
             current_release = spec.raw_release
             expanded_raw_release = spec.expanded_raw_release
             dist = spec.expand("%{?dist}")
-        nodes = ValueParser.parse(current_release)
+            nodes = ValueParser.parse(current_release)
 
-        autorelease_index = cls._find_macro("autorelease", nodes)
-        dist_index = cls._find_macro("dist", nodes)
-        if autorelease_index is not None:
-            # revert to plain %autorelease
-            release = "%autorelease"
-        else:
-            if dist_index is None:
-                if dist and expanded_raw_release and dist in expanded_raw_release:
-                    prefix, suffix = expanded_raw_release.split(dist, 1)
-                else:
-                    prefix = current_release
-                    suffix = ""
+            autorelease_index = cls._find_macro("autorelease", nodes)
+            dist_index = cls._find_macro("dist", nodes)
+            if autorelease_index is not None:
+                # revert to plain %autorelease
+                release = "%autorelease"
             else:
-                prefix = "".join(str(n) for n in nodes[:dist_index])
-                suffix = "".join(str(n) for n in nodes[dist_index + 1 :])
-            if m := re.match(r"^(\d+)(.*)$", prefix):
-                # increase or reset the main numeric part
-                release = str(1 if rebase else int(m.group(1)) + 1) + m.group(2)
-            else:
-                release = prefix + ".1"
-            release += "%{?dist}"
-            if not re.match(r"^\.\d+$", suffix):
-                release += suffix
+                if dist_index is None:
+                    if dist and expanded_raw_release and dist in expanded_raw_release:
+                        prefix, suffix = expanded_raw_release.split(dist, 1)
+                    else:
+                        prefix = current_release
+                        suffix = ""
+                else:
+                    prefix = "".join(str(n) for n in nodes[:dist_index])
+                    suffix = "".join(str(n) for n in nodes[dist_index + 1 :])
+                if m := _LEADING_NUMBER_RE.match(prefix):
+                    # increase or reset the main numeric part
+                    release = str(1 if rebase else int(m.group(1)) + 1) + m.group(2)
+                else:
+                    release = prefix + ".1"
+                release += "%{?dist}"
+                if not _ZSTREAM_COUNTER_RE.match(suffix):
+                    release += suffix
 
-        with Specfile(spec_path) as spec:
             spec.raw_release = release
 
     @classmethod
@@ -344,52 +350,53 @@ class UpdateReleaseTool(Tool[UpdateReleaseToolInput, ToolRunOptions, StringToolO
             current_release = spec.raw_release
             expanded_raw_release = spec.expanded_raw_release
             dist = spec.expand("%{?dist}")
-        nodes = ValueParser.parse(current_release)
-
-        autorelease_index = cls._find_macro("autorelease", nodes)
-        dist_index = cls._find_macro("dist", nodes)
-        if autorelease_index is not None:
-            if abandon_autorelease:
-                zstream_suffix = extract_zstream_suffix(latest_current_stream_build)
-                release = f"{'0' if rebase else base_release}%{{?dist}}.{1 if rebase else zstream_suffix + 1}"
-            elif rebase:
-                # %autorelease present, rebase, reset the release
-                release = "0%{?dist}.%{autorelease -n}"
-            elif dist_index is not None and autorelease_index > dist_index:
-                # %autorelease after %dist, most likely already a Z-Stream release, no change needed
-                release = current_release
+            nodes = ValueParser.parse(current_release)
+
+            autorelease_index = cls._find_macro("autorelease", nodes)
+            dist_index = cls._find_macro("dist", nodes)
+            if autorelease_index is not None:
+                if abandon_autorelease:
+                    zstream_suffix = extract_zstream_suffix(latest_current_stream_build)
+                    release = (
+                        f"{'0' if rebase else base_release}%{{?dist}}.{1 if rebase else zstream_suffix + 1}"
+                    )
+                elif rebase:
+                    # %autorelease present, rebase, reset the release
+                    release = "0%{?dist}.%{autorelease -n}"
+                elif dist_index is not None and autorelease_index > dist_index:
+                    # %autorelease after %dist, most likely already a Z-Stream release, no change needed
+                    release = current_release
+                else:
+                    # no %dist or %autorelease before it, let's create a new release
+                    release = f"{base_release}%{{?dist}}.%{{autorelease -n}}"
             else:
-                # no %dist or %autorelease before it, let's create a new release
-                release = f"{base_release}%{{?dist}}.%{{autorelease -n}}"
-        else:
-            if rebase:
-                # no %autorelease, rebase, reset the release
-                release = "0%{?dist}.1"
-            elif dist_index is None:
-                # no %autorelease and no %dist
-                if dist and expanded_raw_release and dist in expanded_raw_release:
-                    # %dist is embedded in a macro, use the expanded form
-                    before_dist, after_dist = expanded_raw_release.split(dist, 1)
-                    if m := re.match(r"^\.(\d+)$", after_dist):
-                        release = f"{before_dist}%{{?dist}}.{int(m.group(1)) + 1}"
+                if rebase:
+                    # no %autorelease, rebase, reset the release
+                    release = "0%{?dist}.1"
+                elif dist_index is None:
+                    # no %autorelease and no %dist
+                    if dist and expanded_raw_release and dist in expanded_raw_release:
+                        # %dist is embedded in a macro, use the expanded form
+                        before_dist, after_dist = expanded_raw_release.split(dist, 1)
+                        if m := _ZSTREAM_COUNTER_RE.match(after_dist):
+                            release = f"{before_dist}%{{?dist}}.{int(m.group(1)) + 1}"
+                        else:
+                            release = before_dist + "%{?dist}.1"
                     else:
-                        release = before_dist + "%{?dist}.1"
-                else:
-                    release = current_release + "%{?dist}.1"
-            elif dist_index + 1 < len(nodes):
-                prefix = "".join(str(n) for n in nodes[: dist_index + 1])
-                suffix = "".join(str(n) for n in nodes[dist_index + 1 :])
-                if m := re.match(r"^\.(\d+)$", suffix):
-                    # no %autorelease and existing Z-Stream counter after %dist, increase it
-                    release = prefix + "." + str(int(m.group(1)) + 1)
+                        release = current_release + "%{?dist}.1"
+                elif dist_index + 1 < len(nodes):
+                    prefix = "".join(str(n) for n in nodes[: dist_index + 1])
+                    suffix = "".join(str(n) for n in nodes[dist_index + 1 :])
+                    if m := _ZSTREAM_COUNTER_RE.match(suffix):
+                        # no %autorelease and existing Z-Stream counter after %dist, increase it
+                        release = prefix + "." + str(int(m.group(1)) + 1)
+                    else:
+                        # invalid Z-Stream counter, let's try to create a new release
+                        release = f"{base_release}%{{?dist}}.1"
                 else:
-                    # invalid Z-Stream counter, let's try to create a new release
-                    release = f"{base_release}%{{?dist}}.1"
-            else:
-                # no %autorelease, %dist present, add Z-Stream counter
-                release = current_release + ".1"
+                    # no %autorelease, %dist present, add Z-Stream counter
+                    release = current_release + ".1"
 
-        with Specfile(spec_path) as spec:
             spec.raw_release = release
 
     async def _run(
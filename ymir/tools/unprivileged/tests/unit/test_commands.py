@@ -2,8 +2,10 @@ import pytest
 from beeai_framework.middleware.trajectory import GlobalTrajectoryMiddleware
 
 from ymir.tools.unprivileged.commands import (
+    ELLIPSIZED_LINES,
     RunShellCommandTool,
     RunShellCommandToolInput,
+    _ellipsize,
 )
 
 
@@ -62,3 +64,63 @@ async def test_run_shell_command_huge_output(full_output):
     else:
         assert len(result.stdout.splitlines()) == 200
         assert "[...]" in result.stdout.splitlines()
+
+
+@pytest.mark.parametrize(
+    "lines, trailing_newline, ellipsized",
+    [
+        (ELLIPSIZED_LINES, True, False),
+        (ELLIPSIZED_LINES, False, False),
+        (ELLIPSIZED_LINES + 1, True, True),
+        (ELLIPSIZED_LINES + 1, False, True),
+    ],
+)
+def test_ellipsize(lines, trailing_newline, ellipsized):
+    output = "\n".join(f"Line {i}" for i in range(lines)) + ("\n" if trailing_newline else "")
+    result = _ellipsize(output)
+    if not ellipsized:
+        assert result == output
+        return
+    result_lines = result.splitlines()
+    assert len(result_lines) == ELLIPSIZED_LINES
+    assert result_lines[0] == "Line 0"
+    assert result_lines[ELLIPSIZED_LINES // 2 - 1] == "[...]"
+    assert result_lines[-1] == f"Line {lines - 1}"
+    assert result.endswith("\n") == trailing_newline
+
+
+def test_ellipsize_carriage_return_progress():
+    output = "".join(f"Progress {i}%\r" for i in range(1000))
+    result = _ellipsize(output)
+    result_lines = result.splitlines()
+    assert len(result_lines) == ELLIPSIZED_LINES
+    assert result_lines[0] == "Progress 0%"
+    assert result_lines[-1] == "Progress 999%"
+    assert len(result) < len(output) // 4
+
+
+def test_ellipsize_mixed_line_endings_without_trailing_newline():
+    output = "\r\n".join(f"Line {i}" for i in range(ELLIPSIZED_LINES)) + "\rLast"
+    result = _ellipsize(output)
+    result_lines = result.splitlines()
+    assert len(result_lines) == ELLIPSIZED_LINES
+    assert result_lines[0] == "Line 0"
+    assert result_lines[-1] == "Last"
+    assert result.endswith("Last")
+
+
+@pytest.mark.parametrize("separator", ["\n", "\r\n", "\r"])
+def test_ellipsize_multi_megabyte_output(separator):
+    line_count = 200_000
+    output = separator.join(f"Line {i:06}" for i in range(line_count)) + separator
+    assert len(output) > 2_000_000
+    result = _ellipsize(output)
+    head, marker, tail = result.partition("[...]\n")
+    assert marker
+    head_lines = head.splitlines()
+    tail_lines = tail.splitlines()
+    assert len(head_lines) == (ELLIPSIZED_LINES - 1) // 2
+    assert len(tail_lines) == ELLIPSIZED_LINES - 1 - len(head_lines)
+    assert head_lines[0] == "Line 000000"
+    assert tail_lines[0] == f"Line {line_count - len(tail_lines):06}"
+    assert tail_lines[-1] == f"Line {line_count - 1:06}"
@@ -379,6 +379,7 @@ async def test_get_package_info(
     request,
 ):
     spec = request.getfixturevalue(spec_fixture)
+    mtime = spec.stat().st_mtime_ns
     tool = GetPackageInfoTool()
 
     output = await tool.run(input=GetPackageInfoToolInput(spec=spec)).middleware(
@@ -389,6 +390,8 @@ async def test_get_package_info(
     assert result.version == expected_version
     assert result.patch_files == expected_patches
     assert result.patch_strip_levels == expected_strip_levels
+    # read-only, the spec file must not be written back
+    assert spec.stat().st_mtime_ns == mtime
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,103 @@
+from contextlib import asynccontextmanager
+
+import aiohttp
+import pytest
+from flexmock import flexmock
+
+import ymir.tools.unprivileged.upstream_search as upstream_search_mod
+from ymir.tools.unprivileged.upstream_search import (
+    UpstreamSearchResult,
+    UpstreamSearchTool,
+    UpstreamSearchToolInput,
+)
+
+
+async def _async_return(value):
+    return value
+
+
+@pytest.fixture(autouse=True)
+def clear_repository_urls():
+    upstream_search_mod._repository_urls.clear()
+    yield
+    upstream_search_mod._repository_urls.clear()
+
+
+@pytest.fixture
+def repository_url():
+    return "https://github.com/foo/bar.git"
+
+
+@pytest.fixture
+def backend(monkeypatch, repository_url):
+    """Mock the upstream-search backend, returns the list of requested endpoints."""
+    monkeypatch.setenv("UPSTREAM_SEARCH_API_URL", "https://search.example.com")
+    requests = []
+
+    @asynccontextmanager
+    async def fake_get(url, **kwargs):
+        requests.append(url.rsplit("/", 1)[-1])
+        yield flexmock(status=200, json=lambda: _async_return([repository_url]))
+
+    @asynccontextmanager
+    async def fake_post(url, **kwargs):
+        requests.append(url.rsplit("/", 1)[-1])
+        yield flexmock(status=200, json=lambda: _async_return(["abc1234", "def5678"]))
+
+    flexmock(aiohttp.ClientSession).should_receive("get").replace_with(fake_get)
+    flexmock(aiohttp.ClientSession).should_receive("post").replace_with(fake_post)
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_repository_url_is_looked_up_once(backend):
+    tool_input = UpstreamSearchToolInput(project="bar", description="crash", date=None)
+    for _ in range(2):
+        output = await UpstreamSearchTool().run(input=tool_input)
+        assert output.result.result == UpstreamSearchResult.FOUND
+        assert output.result.repository_url == "https://github.com/foo/bar.git"
+    assert backend == ["find_repository", "find_commit", "find_commit"]
+
+
+def test_repository_urls_are_bounded(monkeypatch):
+    monkeypatch.setattr(upstream_search_mod, "_REPOSITORY_URLS_MAX_SIZE", 2)
+    for project in ("a", "b", "c"):
+        upstream_search_mod._remember_repository_url(project, f"https://github.com/{project}.git")
+    assert list(upstream_search_mod._repository_urls) == ["b", "c"]
+
+
+@pytest.mark.parametrize(
+    "repository_url, related_commits",
+    [
+        (
+            "https://github.com/foo/bar.git",
+            [
+                "https://github.com/foo/bar/commit/abc1234.patch",
+                "https://github.com/foo/bar/commit/def5678.patch",
+            ],
+        ),
+        (
+            "https://gitlab.com/group/sub/bar.git",
+            [
+                "https://gitlab.com/group/sub/bar/-/commit/abc1234.patch",
+                "https://gitlab.com/group/sub/bar/-/commit/def5678.patch",
+            ],
+        ),
+        (
+            "https://github.com/foo/foo.github.io.git",
+            [
+                "https://github.com/foo/foo.github.io/commit/abc1234.patch",
+                "https://github.com/foo/foo.github.io/commit/def5678.patch",
+            ],
+        ),
+        ("https://git.example.com/bar.git", ["abc1234", "def5678"]),
+        ("https://github.com/foo/bar", ["abc1234", "def5678"]),
+    ],
+)
+@pytest.mark.asyncio
+async def test_related_commits_are_patch_urls(backend, repository_url, related_commits):
+    output = await UpstreamSearchTool().run(
+        input=UpstreamSearchToolInput(project="bar", description="crash", date=None)
+    )
+    assert output.result.repository_url == repository_url
+    assert output.result.related_commits == related_commits
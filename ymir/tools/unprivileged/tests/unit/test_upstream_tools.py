@@ -448,6 +448,7 @@ class TestCloneUpstreamRepositoryTool:
         ).middleware(GlobalTrajectoryMiddleware(pretty=True))
 
         assert "--filter=blob:none" in captured_cmd
+        assert "--no-checkout" in captured_cmd
 
     @pytest.mark.asyncio
     async def test_clone_timeout_removes_partial_directory(self, tool, tmp_path, monkeypatch):
@@ -677,6 +678,26 @@ class TestFindBaseCommitTool:
         assert "Could not find tag" in result.result
         assert "somerepo-1_0_0" in result.result
 
+    @pytest.mark.asyncio
+    async def test_fetches_tags_only_when_missing(self, tmp_path):
+        origin = self._make_repo(tmp_path, "origin", ["v1.0.0"])
+        repo = tmp_path / "mylib-upstream"
+        subprocess.run(["git", "clone", str(origin), str(repo)], check=True)
+        # tagged on a commit the clone doesn't have yet
+        subprocess.run(["git", "commit", "--allow-empty", "-m", "Release"], cwd=origin, check=True)
+        subprocess.run(["git", "tag", "v2.0.0"], cwd=origin, check=True)
+        release = subprocess.run(
+            ["git", "rev-parse", "v2.0.0"], cwd=origin, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+        tool = FindBaseCommitTool(options={"working_directory": None})
+        result = await tool.run(
+            input=FindBaseCommitToolInput(repo_path=str(repo), version="2.0.0")
+        ).middleware(GlobalTrajectoryMiddleware(pretty=True))
+
+        assert "v2.0.0" in result.result
+        assert tool.options["base_tag_commit"] == release
+
     @pytest.mark.asyncio
     async def test_not_a_git_repo(self, tool, tmp_path):
         with pytest.raises(ToolError, match="Not a git repository"):
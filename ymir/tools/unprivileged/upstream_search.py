@@ -16,6 +16,19 @@ from ymir.tools.http import aiohttp_get_with_retries
 logger = logging.getLogger(__name__)
 
 
+# project name -> repository URL found by the upstream-search backend, the mapping
+# doesn't change so the tool only needs to look up each project once per process;
+# the oldest entry is dropped once the limit is reached
+_REPOSITORY_URLS_MAX_SIZE = 256
+_repository_urls: dict[str, str] = {}
+
+
+def _remember_repository_url(project: str, repository_url: str) -> None:
+    if len(_repository_urls) >= _REPOSITORY_URLS_MAX_SIZE:
+        del _repository_urls[next(iter(_repository_urls))]
+    _repository_urls[project] = repository_url
+
+
 class UpstreamSearchResult(Enum):
     FOUND = "found"
     NOT_FOUND = "not_found"
@@ -69,32 +82,36 @@ class UpstreamSearchTool(Tool[UpstreamSearchToolInput, ToolRunOptions, UpstreamS
         context: RunContext,
     ) -> UpstreamSearchToolOutput:
         try:
-            repos = []
+            repository_url = _repository_urls.get(tool_input.project)
             commits = []
             async with aiohttp.ClientSession(timeout=AIOHTTP_TIMEOUT) as session:
-                async with aiohttp_get_with_retries(
-                    session,
-                    f"{os.environ['UPSTREAM_SEARCH_API_URL']}/find_repository",
-                    params={"name": tool_input.project},
-                ) as response:
-                    if response.status != 200:
-                        logger.debug(
-                            "Searching did not yield repo. status %d response %s",
-                            response.status,
-                            await response.text(),
-                        )
-                        return UpstreamSearchToolOutput(
-                            UpstreamSearchToolResult(
-                                result=UpstreamSearchResult.NOT_POSSIBLE,
-                                repository_url=None,
-                                related_commits=None,
+                if repository_url is None:
+                    async with aiohttp_get_with_retries(
+                        session,
+                        f"{os.environ['UPSTREAM_SEARCH_API_URL']}/find_repository",
+                        params={"name": tool_input.project},
+                    ) as response:
+                        if response.status != 200:
+                            logger.debug(
+                                "Searching did not yield repo. status %d response %s",
+                                response.status,
+                                await response.text(),
                             )
-                        )
-                    repos = await response.json()
+                            return UpstreamSearchToolOutput(
+                                UpstreamSearchToolResult(
+                                    result=UpstreamSearchResult.NOT_POSSIBLE,
+                                    repository_url=None,
+                                    related_commits=None,
+                                )
+                            )
+                        repos = await response.json()
 
-                # until we have solid reference to upstream repository through for example VCS
-                # spec file tag, this is the best we can do
-                post_params = {"url": repos[0], "text": tool_input.description}
+                    # until we have solid reference to upstream repository through for example VCS
+                    # spec file tag, this is the best we can do
+                    repository_url = repos[0]
+                    _remember_repository_url(tool_input.project, repository_url)
+
+                post_params = {"url": repository_url, "text": tool_input.description}
                 if tool_input.date is not None:
                     post_params["date"] = tool_input.date
                 async with session.post(
@@ -121,25 +138,24 @@ class UpstreamSearchTool(Tool[UpstreamSearchToolInput, ToolRunOptions, UpstreamS
         except Exception as e:
             raise ToolError(f"Unexpected internal error occured while contacting backend {e}") from e
 
-        def get_patch_url(commit):
-            parsed_url = urlparse(repos[0])
-            if not parsed_url.path.endswith(".git"):
-                return commit
-            if parsed_url.hostname.startswith("gitlab"):
+        # the patch URL only differs in the commit hash, parse the repository URL once
+        parsed_url = urlparse(repository_url)
+        hostname = parsed_url.hostname or ""
+        prefix = None
+        if parsed_url.path.endswith(".git"):
+            if hostname.startswith("gitlab"):
                 prefix = "/-"
-            elif parsed_url.hostname.startswith("github"):
+            elif hostname.startswith("github"):
                 prefix = ""
-            else:
-                return commit
-            path = f"{prefix}/commit/{commit}.patch"
-            return parsed_url._replace(path=parsed_url.path.replace(".git", path)).geturl()
-
-        commits = [get_patch_url(commit) for commit in commits]
+        if prefix is not None:
+            path = f"{parsed_url.path.removesuffix('.git')}{prefix}/commit/"
+            base = parsed_url._replace(path=path).geturl()
+            commits = [f"{base}{commit}.patch" for commit in commits]
 
         return UpstreamSearchToolOutput(
             UpstreamSearchToolResult(
                 result=UpstreamSearchResult.FOUND,
-                repository_url=repos[0],
+                repository_url=repository_url,
                 related_commits=commits,
             )
         )
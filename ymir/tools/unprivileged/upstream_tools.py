@@ -1,6 +1,7 @@
 """Tools for working with upstream repositories and fix URLs."""
 
 import asyncio
+import os
 import re
 import shutil
 from urllib.parse import quote, urlparse
@@ -22,6 +23,19 @@ from ymir.tools.base import CloneableTool as Tool
 from ymir.tools.constants import AIOHTTP_TIMEOUT, YMIR_USER_AGENT
 from ymir.tools.http import aiohttp_get_with_retries
 
+# GitHub pull request: /owner/repo/pull/123
+_PR_PATH_RE = re.compile(r"/([\w\-\.]+)/([\w\-\.]+)/pull/(\d+)(?:\.patch)?")
+# GitLab merge request: /group/project/-/merge_requests/123
+_MR_PATH_RE = re.compile(r"/(.+?)/(?:-/)?merge_requests/(\d+)(?:\.patch)?")
+# compare URL: /owner/repo/compare/ref1...ref2 or /group/project/-/compare/ref1..ref2
+_COMPARE_PATH_RE = re.compile(r"/(.+?)/(?:-/)?compare/(.+?)(\.{2,3})([^\s\?#]+)")
+# commit URL: /owner/repo/commit/hash or /group/project/-/commit/hash
+_COMMIT_PATH_RE = re.compile(r"^(.*?)(?:/(?:-/)?commit(?:s)?/([a-f0-9]{7,40})(?:\.patch)?)")
+# cgit/gitweb query parameters: ?id=hash, ?h=hash and ?p=repo.git
+_COMMIT_QUERY_RE = re.compile(r"(?:id|h)=([a-f0-9]{7,40})")
+_REPO_QUERY_RE = re.compile(r"(?:^|[?&])p=([^;&]+)")
+_REPO_PATH_RE = re.compile(r"^/?(.+?\.git)(?:/|$)")
+
 
 class ExtractUpstreamRepositoryInput(BaseModel):
     upstream_fix_url: str = Field(description="URL to the upstream fix/commit")
@@ -91,11 +105,8 @@ class ExtractUpstreamRepositoryTool(
             parsed = urlparse(tool_input.upstream_fix_url)
 
             # Check if this is a pull request URL and extract owner/repo/PR number in one match.
-            pr_match = re.search(r"/([\w\-\.]+)/([\w\-\.]+)/pull/(\d+)(?:\.patch)?", parsed.path)
-            mr_match = re.search(
-                r"/(.+?)/(?:-/)?merge_requests/(\d+)(?:\.patch)?",
-                parsed.path,
-            )
+            pr_match = _PR_PATH_RE.search(parsed.path)
+            mr_match = _MR_PATH_RE.search(parsed.path)
 
             if pr_match or mr_match:
                 # Handle GitHub Pull Request or GitLab Merge Request
@@ -156,10 +167,7 @@ class ExtractUpstreamRepositoryTool(
                 )
 
             # Try to match compare URL
-            compare_match = re.search(
-                r"/(.+?)/(?:-/)?compare/(.+?)(\.{2,3})([^\s\?#]+)",
-                parsed.path,
-            )
+            compare_match = _COMPARE_PATH_RE.search(parsed.path)
             if compare_match:
                 # Handle GitHub/GitLab Compare URLs
                 project_path = compare_match.group(1).removesuffix(".git")
@@ -231,25 +239,22 @@ class ExtractUpstreamRepositoryTool(
             # Try to match regular commit URL or query parameter format
             repo_path = None
             commit_hash = None
-            commit_match = re.search(
-                r"^(.*?)(?:/(?:-/)?commit(?:s)?/([a-f0-9]{7,40})(?:\.patch)?)",
-                parsed.path,
-            )
+            commit_match = _COMMIT_PATH_RE.search(parsed.path)
             if commit_match:
                 # Handle regular commit URLs
                 repo_path = commit_match.group(1).strip("/")
                 commit_hash = commit_match.group(2)
             elif parsed.query:
                 # Handle query parameter format (cgit/gitweb)
-                query_match = re.search(r"(?:id|h)=([a-f0-9]{7,40})", parsed.query)
+                query_match = _COMMIT_QUERY_RE.search(parsed.query)
                 if query_match:
                     commit_hash = query_match.group(1)
-                    repo_query_match = re.search(r"(?:^|[?&])p=([^;&]+)", parsed.query)
+                    repo_query_match = _REPO_QUERY_RE.search(parsed.query)
                     if repo_query_match:
                         repo_path = repo_query_match.group(1)
                     else:
                         # cgit-style: repo path in URL path (e.g. /pub/scm/.../linux.git/commit/)
-                        path_repo_match = re.search(r"^/?(.+?\.git)(?:/|$)", parsed.path)
+                        path_repo_match = _REPO_PATH_RE.search(parsed.path)
                         if path_repo_match:
                             repo_path = path_repo_match.group(1)
             if commit_hash:
@@ -294,6 +299,8 @@ class CloneUpstreamRepositoryTool(Tool[CloneUpstreamRepositoryToolInput, ToolRun
     Uses a blobless partial clone (--filter=blob:none): the full commit graph,
     tags, and trees are fetched, but file contents are downloaded on demand.
     All git operations (log, diff, cherry-pick, checkout) work normally.
+    No files are checked out until a base version is checked out
+    (e.g. with find_base_commit).
 
     This is used to get a local copy of the upstream repository so we can:
     - Checkout a specific version/tag
@@ -327,8 +334,16 @@ class CloneUpstreamRepositoryTool(Tool[CloneUpstreamRepositoryToolInput, ToolRun
             # Create parent directory if needed
             clone_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # Clone the repository (blobless: full commit graph but deferred blobs)
-            cmd = ["git", "clone", "--filter=blob:none", tool_input.repo_url, str(clone_path)]
+            # Clone the repository (blobless: full commit graph but deferred blobs),
+            # skip checking out the default branch, the base version is checked out next
+            cmd = [
+                "git",
+                "clone",
+                "--filter=blob:none",
+                "--no-checkout",
+                tool_input.repo_url,
+                str(clone_path),
+            ]
             try:
                 exit_code, _, stderr = await asyncio.wait_for(run_subprocess(cmd), timeout=3600)
             except TimeoutError:
@@ -405,16 +420,22 @@ class FindBaseCommitTool(Tool[FindBaseCommitToolInput, ToolRunOptions, StringToo
             if not (tool_input.repo_path / ".git").exists():
                 raise ToolError(f"Not a git repository: {tool_input.repo_path}")
 
-            # Fetch all tags to ensure we have the latest
-            cmd = ["git", "fetch", "--tags"]
-            exit_code, stdout, stderr = await run_subprocess(cmd, cwd=tool_input.repo_path)
-            if exit_code != 0:
-                # Non-fatal, continue anyway (might work with existing tags)
-                pass
+            async def run_with_fetch_fallback(cmd: list[str]) -> tuple[int, str | None, str | None]:
+                """Run cmd, fetching tags from the remote and retrying if it fails.
+
+                A fresh clone already has the tags, only go to the network
+                when the wanted ref isn't in the repository yet.
+                """
+                result = await run_subprocess(cmd, cwd=tool_input.repo_path)
+                if result[0] == 0:
+                    return result
+                # Non-fatal, retry anyway (might work with existing tags)
+                await run_subprocess(["git", "fetch", "--tags"], cwd=tool_input.repo_path)
+                return await run_subprocess(cmd, cwd=tool_input.repo_path)
 
             if tool_input.commit:
                 cmd = ["git", "rev-parse", "--verify", f"{tool_input.commit}^{{commit}}"]
-                exit_code, _, stderr = await run_subprocess(cmd, cwd=tool_input.repo_path)
+                exit_code, _, stderr = await run_with_fetch_fallback(cmd)
                 if exit_code != 0:
                     raise ToolError(f"Commit '{tool_input.commit}' not found in repository: {stderr}")
                 cmd = ["git", "checkout", tool_input.commit]
@@ -435,7 +456,7 @@ class FindBaseCommitTool(Tool[FindBaseCommitToolInput, ToolRunOptions, StringToo
 
             if tool_input.tag:
                 cmd = ["git", "rev-parse", "--verify", f"refs/tags/{tool_input.tag}"]
-                exit_code, _, stderr = await run_subprocess(cmd, cwd=tool_input.repo_path)
+                exit_code, _, stderr = await run_with_fetch_fallback(cmd)
                 if exit_code != 0:
                     raise ToolError(f"Tag '{tool_input.tag}' not found in repository: {stderr}")
                 found_tag = tool_input.tag
@@ -482,22 +503,22 @@ class FindBaseCommitTool(Tool[FindBaseCommitToolInput, ToolRunOptions, StringToo
                     )
 
                 tag_patterns = list(dict.fromkeys(tag_patterns))
+                # list all tags once and match the candidates locally
+                # instead of probing each of them with a separate git process
+                cmd = ["git", "for-each-ref", "--format=%(refname:lstrip=2)", "refs/tags/"]
                 found_tag = None
-                for tag in tag_patterns:
-                    cmd = ["git", "rev-parse", "--verify", f"refs/tags/{tag}"]
-                    exit_code, _, _ = await run_subprocess(cmd, cwd=tool_input.repo_path)
-                    if exit_code == 0:
-                        found_tag = tag
+                for fetched in (False, True):
+                    if fetched:
+                        # Non-fatal, continue anyway (might work with existing tags)
+                        await run_subprocess(["git", "fetch", "--tags"], cwd=tool_input.repo_path)
+                    exit_code, stdout, stderr = await run_subprocess(cmd, cwd=tool_input.repo_path)
+                    all_tags = stdout.splitlines() if exit_code == 0 and stdout else []
+                    existing_tags = set(all_tags)
+                    found_tag = next((tag for tag in tag_patterns if tag in existing_tags), None)
+                    if found_tag:
                         break
 
                 if not found_tag:
-                    cmd = ["git", "tag", "-l"]
-                    exit_code, stdout, stderr = await run_subprocess(
-                        cmd,
-                        cwd=tool_input.repo_path,
-                    )
-                    all_tags = stdout.strip().split("\n") if stdout.strip() else []
-
                     relevant = [t for t in all_tags if ver_under in t or ver in t or ver_upper in t]
                     relevant_set = set(relevant)
                     other = [t for t in all_tags if t not in relevant_set]
@@ -615,13 +636,15 @@ class ApplyDownstreamPatchesTool(Tool[ApplyDownstreamPatchesToolInput, ToolRunOp
                 )
 
             applied_patches = []
+            # list the directory once instead of stat-ing every patch file
+            existing_patches = {entry.name for entry in os.scandir(tool_input.patches_directory)}
 
             # Apply each patch in order
             for patch_file in tool_input.patch_files:
                 patch_path = tool_input.patches_directory / patch_file
 
-                # Check if patch file exists
-                if not patch_path.exists():
+                # Check if patch file exists, patch files in subdirectories need a stat
+                if patch_file not in existing_patches and not patch_path.exists():
                     raise ToolError(
                         f"Patch file not found: {patch_path}. "
                         f"Successfully applied: {', '.join(applied_patches) if applied_patches else 'none'}. "
@@ -749,28 +772,19 @@ class CherryPickCommitTool(Tool[CherryPickCommitToolInput, ToolRunOptions, Strin
                 # Success - no conflicts
                 return StringToolOutput(result=f"Successfully cherry-picked commit {tool_input.commit_hash}")
 
-            # Check if it's a conflict or other error
-            cmd = ["git", "status", "--porcelain"]
+            # Check if it's a conflict or other error, git lists the unmerged paths itself
+            cmd = ["git", "diff", "--name-only", "--diff-filter=U"]
             exit_code_status, stdout_status, _ = await run_subprocess(cmd, cwd=tool_input.repo_path)
 
             if exit_code_status == 0 and stdout_status:
-                # Any two-letter code where either letter is U, plus AA/DD,
-                # indicates an unmerged file. This covers UU, AU, UA, UD, DU, AA, DD.
-                unmerged_prefixes = ("UU ", "AA ", "DD ", "AU ", "UA ", "UD ", "DU ")
-                conflict_files = [
-                    line[3:].strip()
-                    for line in stdout_status.strip().split("\n")
-                    if line.startswith(unmerged_prefixes)
-                ]
-
-                if conflict_files:
-                    self.options["fix_commit"] = tool_input.commit_hash
-                    return StringToolOutput(
-                        result="Cherry-pick has conflicts in the following files: "
-                        f"{', '.join(conflict_files)}. "
-                        "Resolve the conflicts manually, then use "
-                        f"cherry_pick_continue tool. Git error: {stderr}"
-                    )
+                conflict_files = stdout_status.splitlines()
+                self.options["fix_commit"] = tool_input.commit_hash
+                return StringToolOutput(
+                    result="Cherry-pick has conflicts in the following files: "
+                    f"{', '.join(conflict_files)}. "
+                    "Resolve the conflicts manually, then use "
+                    f"cherry_pick_continue tool. Git error: {stderr}"
+                )
 
             if "nothing to commit" in (stderr or "") or "cherry-pick is now empty" in (stderr or ""):
                 return StringToolOutput(
@@ -828,25 +842,23 @@ class CherryPickContinueTool(Tool[CherryPickContinueToolInput, ToolRunOptions, S
             # Verify it's a git repository
             if not (tool_input.repo_path / ".git").exists():
                 raise ToolError(f"Not a git repository: {tool_input.repo_path}")
-            # Check if we're in a cherry-pick state
-            cmd = ["git", "status", "--porcelain"]
-            exit_code, stdout, stderr = await run_subprocess(cmd, cwd=tool_input.repo_path)
-
-            if exit_code != 0:
-                raise ToolError(f"Failed to check git status: {stderr}")
-
             # Check if we're actually in a cherry-pick state by looking for .git/CHERRY_PICK_HEAD
             if not (tool_input.repo_path / ".git" / "CHERRY_PICK_HEAD").exists():
                 raise ToolError("Not in a cherry-pick state. Cannot continue cherry-pick.")
 
-            unmerged_prefixes = ("UU ", "AA ", "DD ", "AU ", "UA ", "UD ", "DU ")
-            for line in (stdout or "").strip().split("\n") if (stdout or "").strip() else []:
-                if line.startswith(unmerged_prefixes):
-                    conflict_file = line[3:].strip()
-                    raise ToolError(
-                        f"Unresolved conflicts still exist in: {conflict_file}. "
-                        "Resolve the conflict markers in this file first, then call this tool again."
-                    )
+            # Check for paths that are still unmerged, this has to happen before `git add -A`
+            # which would mark files with conflict markers as resolved
+            cmd = ["git", "diff", "--name-only", "--diff-filter=U"]
+            exit_code, stdout, stderr = await run_subprocess(cmd, cwd=tool_input.repo_path)
+
+            if exit_code != 0:
+                raise ToolError(f"Failed to list unmerged files: {stderr}")
+
+            if conflict_files := (stdout or "").splitlines():
+                raise ToolError(
+                    f"Unresolved conflicts still exist in: {conflict_files[0]}. "
+                    "Resolve the conflict markers in this file first, then call this tool again."
+                )
 
             # Stage all resolved files
             cmd = ["git", "add", "-A"]
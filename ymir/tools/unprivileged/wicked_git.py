@@ -532,13 +532,21 @@ class GitPatchCreationTool(Tool[GitPatchCreationToolInput, ToolRunOptions, Strin
                     "or 'apply_downstream_patches' is run before this tool. "
                     f"Options: {self.options}"
                 )
-            cmd = ["git", "format-patch", "--no-signature", "--stdout", f"{base_commit_sha}..HEAD"]
-            exit_code, stdout, stderr = await run_subprocess(cmd, cwd=tool_input.repository_path)
+            # let git write the patch file itself, the patch doesn't need to pass
+            # through Python and non-UTF-8 content is kept byte for byte
+            cmd = [
+                "git",
+                "format-patch",
+                "--no-signature",
+                f"--output={tool_input.patch_file_path}",
+                f"{base_commit_sha}..HEAD",
+            ]
+            exit_code, _, stderr = await run_subprocess(cmd, cwd=tool_input.repository_path)
             if exit_code != 0:
                 raise ToolError(f"Command git-format-patch failed: {stderr}")
-            if not stdout:
+            if tool_input.patch_file_path.stat().st_size == 0:
+                tool_input.patch_file_path.unlink()
                 raise ToolError("Generated patch is empty")
-            tool_input.patch_file_path.write_text(stdout, encoding="utf-8")
             return StringToolOutput(
                 result=f"Successfully created a patch file: {tool_input.patch_file_path} "
                 f"(base commit: {base_commit_sha})"